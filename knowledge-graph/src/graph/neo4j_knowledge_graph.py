@@ -14,9 +14,22 @@ class Neo4jKnowledgeGraph:
     def __init__(self, uri: str = "bolt://localhost:7687", 
                  username: str = "neo4j", 
                  password: str = "password",
-                 embedding_model: str = "all-MiniLM-L6-v2"):
+                 embedding_model: str = "all-MiniLM-L6-v2",
+                 driver_config: Optional[Dict[str, Any]] = None):
         
-        self.driver = GraphDatabase.driver(uri, auth=(username, password))
+        # Long-lived pooled connections with TCP keep-alive, so repeated
+        # queries reuse an open Bolt channel instead of reconnecting.
+        # driver_config overrides these pool settings.
+        self.driver = GraphDatabase.driver(
+            uri,
+            auth=(username, password),
+            **{
+                "keep_alive": True,
+                "max_connection_lifetime": 3600,
+                "connection_acquisition_timeout": 5,
+                **(driver_config or {})
+            }
+        )
         self.embedding_model = SentenceTransformer(embedding_model)
         
         # Initialize logger first
@@ -43,8 +56,8 @@ class Neo4jKnowledgeGraph:
         self._create_constraints_and_indexes()
     
     @contextmanager
-    def get_session(self):
-        session = self.driver.session()
+    def get_session(self, **session_config):
+        session = self.driver.session(**session_config)
         try:
             yield session
         finally:
@@ -55,7 +68,7 @@ class Neo4jKnowledgeGraph:
         constraints_and_indexes = [
             "CREATE CONSTRAINT state_name_unique IF NOT EXISTS FOR (s:State) REQUIRE s.name IS UNIQUE",
             "CREATE CONSTRAINT component_id_unique IF NOT EXISTS FOR (c:Component) REQUIRE c.id IS UNIQUE",
-            "CREATE INDEX state_name_idx IF NOT EXISTS FOR (s:State) ON (s.name)",
+            # State.name and Component.id are indexed by the uniqueness constraints above
             "CREATE INDEX component_name_idx IF NOT EXISTS FOR (c:Component) ON (c.name)",
             "CREATE INDEX component_type_idx IF NOT EXISTS FOR (c:Component) ON (c.component_type)"
         ]
@@ -259,6 +272,10 @@ class Neo4jKnowledgeGraph:
             ids=[f"scenario_{scenario.id or 0}"]
         )
     
+    def has_business_scenarios(self) -> bool:
+        """Check whether the vector store holds any business scenarios"""
+        return self.scenario_collection.count() > 0
+    
     def find_similar_business_scenarios(self, query: str, top_k: int = 5) -> List[Dict[str, Any]]:
         """Find business scenarios similar to the query"""
         query_embedding = self.embedding_model.encode([query])[0]
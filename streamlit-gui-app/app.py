@@ -14,24 +14,35 @@ This is a refactored, production-ready version of the GUI testing tool with:
 import streamlit as st
 import sys
 import os
+import threading
 from pathlib import Path
 
 # Add project root to path
 PROJECT_ROOT = Path(__file__).parent
-sys.path.append(str(PROJECT_ROOT))
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
 
 # Import configuration and core modules
 from config.settings import settings
-from utils.logging_config import setup_logging, logger
+from utils.logging_config import setup_logging, logger, StreamlitLogHandler
 from utils.session_manager import SessionManager
 from utils.ui_components import UIComponents
 from utils.caching import PerformanceMonitor
 from services.database_manager import DatabaseManager
 
-# Import page modules
-from pages.query_generation import QueryGenerationPage
-from pages.knowledge_graph import KnowledgeGraphPage
-from pages.scenario_management import ScenarioManagementPage
+# Serializes database initialization across concurrent sessions
+_init_lock = threading.Lock()
+
+@st.cache_resource(show_spinner=False)
+def bootstrap_logging() -> bool:
+    """Configure logging once per server process"""
+    setup_logging(
+        log_level="DEBUG" if settings.app.debug else "INFO",
+        log_file="logs/app.log" if not settings.app.debug else None
+    )
+    
+    logger.info(f"Starting GUI Testing Tool v{settings.app.version}")
+    return True
 
 class GUITestingApp:
     """Main application class for the GUI Testing Tool"""
@@ -45,26 +56,28 @@ class GUITestingApp:
         # Configure Streamlit page
         st.set_page_config(**settings.get_page_config())
         
-        # Apply theme CSS
+        # Apply theme CSS (must be re-emitted each run or Streamlit drops it)
         st.markdown(settings.get_theme_css(), unsafe_allow_html=True)
         
-        # Setup logging
-        setup_logging(
-            log_level="DEBUG" if settings.app.debug else "INFO",
-            log_file="logs/app.log" if not settings.app.debug else None
-        )
-        
-        logger.info(f"Starting GUI Testing Tool v{settings.app.version}")
+        # Setup logging once per process rather than on every rerun
+        bootstrap_logging()
     
     @PerformanceMonitor.time_function("app_initialization")
     def initialize_session(self):
         """Initialize session state and connections"""
+        # Nothing to do once this session is connected; the sentinel is
+        # cleared by SessionManager.reset_connection_state
+        if SessionManager.get('_initialized'):
+            return
+        
         # Initialize session state
         SessionManager.initialize_session_state()
         
-        # Initialize database connection if not already connected
+        # Initialize database connection if not already connected. Sessions
+        # initialize one at a time so concurrent first loads share one real
+        # connect/scenario load and the rest hit the cached resources.
         if not SessionManager.is_connected():
-            with st.spinner("Initializing database connection..."):
+            with st.spinner("Initializing database connection..."), _init_lock:
                 success, message = DatabaseManager.initialize_connection()
                 
                 if success:
@@ -76,18 +89,19 @@ class GUITestingApp:
                         logger.warning(f"Scenarios initialization issue: {scenario_message}")
                 else:
                     logger.error(f"Database connection failed: {message}")
+        
+        if SessionManager.is_connected():
+            SessionManager.set('_initialized', True)
     
     def render_header(self):
         """Render the application header"""
         UIComponents.render_header()
     
-    def render_sidebar(self):
+    def render_sidebar(self, connection_status: str):
         """Render the sidebar with system status and controls"""
         with st.sidebar:
-            UIComponents.render_connection_status(
-                SessionManager.get('connection_status'),
-                SessionManager.get('scenarios_initialized', False)
-            )
+            scenarios_initialized = SessionManager.get('scenarios_initialized')
+            UIComponents.render_connection_status(connection_status, bool(scenarios_initialized))
             
             # Connection refresh button
             if st.button("🔄 Refresh Connection", key="refresh_connection"):
@@ -114,14 +128,17 @@ class GUITestingApp:
                     st.write("No database connection")
             except Exception as e:
                 st.write(f"Error: {e}")
+            
+            st.write("**Performance:**")
+            st.json(PerformanceMonitor.dump())
     
-    def render_main_content(self):
+    def render_main_content(self, connected: bool):
         """Render the main application content"""
-        # Check if we can proceed
-        issues = SessionManager.validate_session_state()
-        
-        if issues:
-            self._render_connection_issues(issues)
+        # A connected session always has its knowledge graph and query
+        # interface (all three are set together), so only a disconnected
+        # one needs the full check
+        if not connected:
+            self._render_connection_issues(SessionManager.validate_session_state())
             return
         
         # Main tabbed interface
@@ -131,21 +148,26 @@ class GUITestingApp:
             "📋 Scenario Management"
         ])
         
+        # Page modules are imported here rather than at module load so their
+        # dependency chains don't delay set_page_config and the first paint
         with tab1:
+            from pages.query_generation import QueryGenerationPage
             QueryGenerationPage.render()
         
         with tab2:
+            from pages.knowledge_graph import KnowledgeGraphPage
             KnowledgeGraphPage.render()
         
         with tab3:
+            from pages.scenario_management import ScenarioManagementPage
             ScenarioManagementPage.render()
     
     def _render_connection_issues(self, issues: dict):
         """Render connection issues and troubleshooting"""
-        st.error("❌ Cannot proceed due to connection issues:")
-        
-        for component, issue in issues.items():
-            st.error(f"• {component}: {issue}")
+        st.error("\n".join(
+            ["❌ Cannot proceed due to connection issues:", ""] +
+            [f"- {component}: {issue}" for component, issue in issues.items()]
+        ))
         
         st.markdown("### 🔧 Troubleshooting:")
         st.markdown("""
@@ -187,17 +209,24 @@ class GUITestingApp:
     @PerformanceMonitor.time_function("full_app_render")
     def run(self):
         """Main application run method"""
+        # Log messages from this run are shown together here once it finishes
+        log_area = st.container()
+        
         try:
             # Initialize the session
             self.initialize_session()
             
+            # Read the connection status once per run for the components below
+            connection_status = SessionManager.get('connection_status')
+            connected = connection_status == 'connected'
+            
             # Render application components
             self.render_header()
-            self.render_sidebar()
-            self.render_main_content()
+            self.render_sidebar(connection_status)
+            self.render_main_content(connected)
             
             # Footer
-            self._render_footer()
+            self._render_footer(connected)
             
         except Exception as e:
             logger.error(f"Application error: {e}")
@@ -205,26 +234,22 @@ class GUITestingApp:
             
             if settings.app.debug:
                 st.exception(e)
+        
+        finally:
+            StreamlitLogHandler.flush_to_ui(log_area)
     
-    def _render_footer(self):
+    def _render_footer(self, connected: bool):
         """Render application footer"""
-        st.markdown("---")
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            st.markdown(f"**Version:** {settings.app.version}")
-        
-        with col2:
-            if SessionManager.is_connected():
-                st.markdown("**Status:** 🟢 Connected")
-            else:
-                st.markdown("**Status:** 🔴 Disconnected")
+        status = "🟢 Connected" if connected else "🔴 Disconnected"
+        mode = "🔧 Debug" if settings.app.debug else "🚀 Production"
         
-        with col3:
-            if settings.app.debug:
-                st.markdown("**Mode:** 🔧 Debug")
-            else:
-                st.markdown("**Mode:** 🚀 Production")
+        # One element for the whole footer instead of one per column
+        st.markdown(
+            "---\n\n"
+            "| Version | Status | Mode |\n"
+            "|---|---|---|\n"
+            f"| {settings.app.version} | {status} | {mode} |"
+        )
 
 # Application entry point
 def main():
@@ -245,14 +270,6 @@ def main():
             st.exception(e)
         
         st.stop()
-    
-    finally:
-        # Cleanup on exit
-        try:
-            DatabaseManager.close_connection()
-            logger.info("Application cleanup completed")
-        except Exception as e:
-            logger.warning(f"Error during cleanup: {e}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
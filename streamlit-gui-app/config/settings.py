@@ -3,11 +3,15 @@ Configuration settings for the GUI Testing Tool Streamlit app
 """
 
 import os
-from typing import Dict, Any
-from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, Any, Callable, Mapping, Tuple
+from dataclasses import dataclass, replace
 from pathlib import Path
 
-@dataclass
+# Config sections are frozen and updated with dataclasses.replace. They are
+# not slotted: dataclass(slots=True) needs Python 3.10, and the app shares
+# its interpreter with the knowledge graph package, which supports 3.8+
+@dataclass(frozen=True)
 class DatabaseConfig:
     """Neo4j database configuration"""
     uri: str = "bolt://localhost:7687"
@@ -15,8 +19,14 @@ class DatabaseConfig:
     password: str = "tiktoktechjam"
     connection_timeout: int = 30
     max_retry_attempts: int = 3
+    
+    # Driver connection pool
+    max_connection_pool_size: int = 50
+    connection_acquisition_timeout: int = 60
+    max_connection_lifetime: int = 3600
+    keep_alive: bool = True
 
-@dataclass
+@dataclass(frozen=True)
 class UIConfig:
     """UI configuration and theme settings"""
     page_title: str = "GUI Testing Tool"
@@ -33,7 +43,7 @@ class UIConfig:
     dark_grey: str = "#1a1a1a"
     card_background: str = "#2a2a2a"
 
-@dataclass
+@dataclass(frozen=True)
 class AutomationConfig:
     """Automation service configuration"""
     base_url: str = "http://localhost:8000"
@@ -41,8 +51,12 @@ class AutomationConfig:
     timeout: int = 30
     health_check_timeout: int = 5
     max_retries: int = 3
+    # Seconds the server may hold a status long poll open waiting for a change;
+    # also the live status refresh interval. Kept short because the poll
+    # holds the session's script thread
+    status_poll_wait: int = 2
     
-@dataclass
+@dataclass(frozen=True)
 class AppConfig:
     """Main application configuration"""
     app_title: str = "🤖 Bombotest GUI Test"
@@ -52,12 +66,62 @@ class AppConfig:
     
     # Performance settings
     cache_ttl: int = 300  # 5 minutes
+    cache_max_entries: int = 1024
     max_scenario_steps: int = 20
     default_spinner_text: str = "Processing..."
     
     # File paths
     knowledge_graph_path: str = "../knowledge-graph"
     chroma_db_path: str = "./chroma_db"
+    scenario_index_cache: str = "~/.cache/coffeewauto/scen_index.pkl"
+
+# Static stylesheet and the UIConfig colors it reads as CSS custom properties
+THEME_CSS_FILE = Path(__file__).resolve().parent.parent / "static" / "theme.css"
+THEME_COLOR_FIELDS = (
+    "primary_color",
+    "secondary_color",
+    "background_color",
+    "text_color",
+    "grey_color",
+    "dark_grey",
+    "card_background",
+)
+
+# Environment variable overrides: field -> (variable name, converter)
+DATABASE_ENV_VARS = {
+    "uri": ("NEO4J_URI", str),
+    "username": ("NEO4J_USERNAME", str),
+    "password": ("NEO4J_PASSWORD", str),
+    "max_connection_pool_size": ("NEO4J_MAX_CONNECTION_POOL_SIZE", int),
+    "connection_acquisition_timeout": ("NEO4J_CONNECTION_ACQUISITION_TIMEOUT", int),
+    "max_connection_lifetime": ("NEO4J_MAX_CONNECTION_LIFETIME", int),
+}
+
+APP_ENV_VARS = {
+    "version": ("APP_VERSION", str),
+    "knowledge_graph_path": ("KG_PATH", str),
+    "chroma_db_path": ("CHROMA_DB_PATH", str),
+    "cache_max_entries": ("CACHE_MAX_ENTRIES", int),
+    "scenario_index_cache": ("SCENARIO_INDEX_CACHE", str),
+}
+
+AUTOMATION_ENV_VARS = {
+    "base_url": ("AUTOMATION_BASE_URL", str),
+    "websocket_url": ("AUTOMATION_WEBSOCKET_URL", str),
+    "timeout": ("AUTOMATION_TIMEOUT", int),
+    "health_check_timeout": ("AUTOMATION_HEALTH_TIMEOUT", int),
+    "max_retries": ("AUTOMATION_MAX_RETRIES", int),
+    "status_poll_wait": ("AUTOMATION_STATUS_POLL_WAIT", int),
+}
+
+def _read_environment(env_vars: Dict[str, Tuple[str, Callable[[str], Any]]]) -> Dict[str, Any]:
+    """Collect the overrides that are set in the environment, converted to field types"""
+    environ = os.environ
+    return {
+        field: convert(environ[var])
+        for field, (var, convert) in env_vars.items()
+        if var in environ
+    }
 
 class Settings:
     """Centralized settings management"""
@@ -68,128 +132,65 @@ class Settings:
         self.app = AppConfig()
         self.automation = AutomationConfig()
         self._load_from_environment()
+        
+        # Settings are fixed after construction, so build derived values once
+        self._page_config = self._build_page_config()
+        self._database_config = self._build_database_config()
+        self._theme_css = self._build_theme_css()
     
     def _load_from_environment(self):
         """Load configuration from environment variables"""
-        # Database settings
-        self.database.uri = os.getenv("NEO4J_URI", self.database.uri)
-        self.database.username = os.getenv("NEO4J_USERNAME", self.database.username)
-        self.database.password = os.getenv("NEO4J_PASSWORD", self.database.password)
-        
-        # App settings
-        self.app.debug = os.getenv("DEBUG", "false").lower() == "true"
-        self.app.version = os.getenv("APP_VERSION", self.app.version)
-        
-        # Paths
-        self.app.knowledge_graph_path = os.getenv("KG_PATH", self.app.knowledge_graph_path)
-        self.app.chroma_db_path = os.getenv("CHROMA_DB_PATH", self.app.chroma_db_path)
-        
-        # Automation settings
-        self.automation.base_url = os.getenv("AUTOMATION_BASE_URL", self.automation.base_url)
-        self.automation.websocket_url = os.getenv("AUTOMATION_WEBSOCKET_URL", self.automation.websocket_url)
-        self.automation.timeout = int(os.getenv("AUTOMATION_TIMEOUT", str(self.automation.timeout)))
-        self.automation.health_check_timeout = int(os.getenv("AUTOMATION_HEALTH_TIMEOUT", str(self.automation.health_check_timeout)))
-        self.automation.max_retries = int(os.getenv("AUTOMATION_MAX_RETRIES", str(self.automation.max_retries)))
+        self.database = replace(self.database, **_read_environment(DATABASE_ENV_VARS))
+        self.app = replace(
+            self.app,
+            debug=os.getenv("DEBUG", "false").lower() == "true",
+            **_read_environment(APP_ENV_VARS)
+        )
+        self.automation = replace(self.automation, **_read_environment(AUTOMATION_ENV_VARS))
     
-    def get_page_config(self) -> Dict[str, Any]:
+    def get_page_config(self) -> Mapping[str, Any]:
         """Get Streamlit page configuration"""
-        return {
+        return self._page_config
+    
+    def get_database_config(self) -> Mapping[str, Any]:
+        """Get database configuration"""
+        return self._database_config
+    
+    def _build_page_config(self) -> Mapping[str, Any]:
+        """Build the read-only Streamlit page configuration"""
+        return MappingProxyType({
             "page_title": self.ui.page_title,
             "page_icon": self.ui.page_icon,
             "layout": self.ui.layout,
             "initial_sidebar_state": self.ui.sidebar_state
-        }
+        })
     
-    def get_database_config(self) -> Dict[str, Any]:
-        """Get database configuration"""
-        return {
+    def _build_database_config(self) -> Mapping[str, Any]:
+        """Build the read-only database configuration"""
+        return MappingProxyType({
             "uri": self.database.uri,
             "username": self.database.username,
             "password": self.database.password,
             "connection_timeout": self.database.connection_timeout,
-            "max_retry_attempts": self.database.max_retry_attempts
-        }
+            "max_retry_attempts": self.database.max_retry_attempts,
+            "max_connection_pool_size": self.database.max_connection_pool_size,
+            "connection_acquisition_timeout": self.database.connection_acquisition_timeout,
+            "max_connection_lifetime": self.database.max_connection_lifetime,
+            "keep_alive": self.database.keep_alive
+        })
     
     def get_theme_css(self) -> str:
-        """Generate CSS for the application theme"""
-        return f"""
-        <style>
-            /* Global theme colors */
-            .main {{
-                background-color: {self.ui.background_color};
-                color: {self.ui.text_color};
-            }}
-            
-            /* Button styling */
-            .stButton > button {{
-                background-color: {self.ui.primary_color};
-                color: {self.ui.text_color};
-                border: none;
-                border-radius: 8px;
-                font-weight: bold;
-            }}
-            
-            .stButton > button:hover {{
-                background-color: {self.ui.secondary_color};
-                color: {self.ui.background_color};
-                border: none;
-            }}
-            
-            /* Input styling */
-            .stSelectbox > div > div,
-            .stTextArea > div > div > textarea,
-            .stTextInput > div > div > input {{
-                background-color: {self.ui.dark_grey};
-                color: {self.ui.text_color};
-                border: 1px solid {self.ui.grey_color};
-            }}
-            
-            /* Expander styling */
-            .stExpander {{
-                background-color: {self.ui.dark_grey};
-                border: 1px solid {self.ui.grey_color};
-            }}
-            
-            /* Tab styling */
-            .stTabs [data-baseweb="tab-list"] {{
-                gap: 8px;
-            }}
-            
-            .stTabs [data-baseweb="tab"] {{
-                background-color: {self.ui.dark_grey};
-                color: {self.ui.grey_color};
-                border: 1px solid {self.ui.grey_color};
-                border-radius: 8px 8px 0px 0px;
-                padding: 10px 20px;
-            }}
-            
-            .stTabs [aria-selected="true"] {{
-                background-color: {self.ui.primary_color} !important;
-                color: {self.ui.text_color} !important;
-            }}
-            
-            /* Sidebar styling */
-            .css-1d391kg {{
-                background-color: {self.ui.dark_grey};
-            }}
-            
-            /* Success/Error message styling */
-            .stAlert > div {{
-                background-color: {self.ui.secondary_color};
-                color: {self.ui.background_color};
-                border: none;
-            }}
-            
-            /* Metric styling */
-            .metric-container {{
-                background-color: {self.ui.dark_grey};
-                border: 1px solid {self.ui.secondary_color};
-                border-radius: 8px;
-                padding: 15px;
-                text-align: center;
-            }}
-        </style>
-        """
+        """Get the precomputed CSS for the application theme"""
+        return self._theme_css
+    
+    def _build_theme_css(self) -> str:
+        """Generate CSS for the application theme from the static stylesheet"""
+        variables = "\n".join(
+            f"    --{field.replace('_', '-')}: {getattr(self.ui, field)};"
+            for field in THEME_COLOR_FIELDS
+        )
+        stylesheet = THEME_CSS_FILE.read_text(encoding="utf-8")
+        return f"<style>\n:root {{\n{variables}\n}}\n{stylesheet}</style>"
 
 # Global settings instance
 settings = Settings()
\ No newline at end of file
@@ -2,15 +2,211 @@
 Knowledge Graph Explorer page module
 """
 
+import functools
+import re
 import streamlit as st
 from streamlit_agraph import agraph, Node, Edge, Config
-from typing import List, Tuple
+from neo4j import READ_ACCESS, unit_of_work
+from neo4j.exceptions import ClientError
+from typing import Dict, List, Optional, Set, Tuple
 from utils.ui_components import UIComponents
 from utils.session_manager import SessionManager
-from utils.caching import cached_function, PerformanceMonitor
+from utils.caching import PerformanceMonitor
 from utils.logging_config import logger
 from config.settings import settings
 
+# States, components, HAS_COMPONENT edges and action edges in a single
+# result, each row tagged with its kind. Nodes without an id or name can't
+# be drawn, so they are dropped before the $max_nodes best-connected nodes
+# are kept. Edges are only returned when both ends are drawn nodes. The
+# visualization toggles are parameters so Neo4j only returns the requested
+# subset, and each item is already the Node/Edge keyword map the page needs.
+GRAPH_DATA_QUERY = """
+CALL {
+    MATCH (s:State)
+    WHERE s.name <> ''
+    RETURN s AS n, COUNT { (s)--() } AS degree
+    UNION ALL
+    MATCH (c:Component)
+    WHERE $show_components AND c.id <> '' AND c.name <> ''
+    RETURN c AS n, COUNT { (c)--() } AS degree
+}
+WITH n ORDER BY degree DESC LIMIT $max_nodes
+WITH collect(n) AS drawn
+CALL {
+    WITH drawn
+    UNWIND drawn AS s
+    WITH s WHERE s:State
+    RETURN 'state' AS kind, {
+        id: s.name, label: replace(s.name, 'Page', '\\nPage'), size: 30,
+        color: $state_color, shape: 'dot', font: {color: $text_color}
+    } AS item
+    ORDER BY s.name
+    UNION ALL
+    WITH drawn
+    UNWIND drawn AS c
+    WITH c WHERE c:Component
+    RETURN 'component' AS kind, {
+        id: c.id, label: c.name, size: 20,
+        color: $component_color, shape: 'dot', font: {color: $text_color}
+    } AS item
+    ORDER BY c.name
+    UNION ALL
+    WITH drawn
+    UNWIND drawn AS s
+    MATCH (s:State)-[:HAS_COMPONENT]->(c:Component)
+    WHERE c IN drawn
+    RETURN 'has_component' AS kind, {
+        source: s.name, target: c.id, color: $text_color, width: 1
+    } AS item
+    UNION ALL
+    WITH drawn
+    UNWIND drawn AS c
+    MATCH (c:Component)-[r:TAP|SWIPE|SCROLL|TYPE]->(s:State)
+    WHERE $show_transitions AND s IN drawn
+    RETURN 'action' AS kind, {
+        source: c.id, target: s.name, label: type(r),
+        color: coalesce($action_colors[type(r)], $text_color), width: 2
+    } AS item
+}
+RETURN kind, item
+"""
+
+# Details for every state and component, keyed by node id, so node clicks
+# don't need a query
+NODE_DETAILS_QUERY = """
+CALL {
+    MATCH (s:State)
+    RETURN 'states' AS kind, s.name AS id, {
+        components: [(s)-[:HAS_COMPONENT]->(c:Component) |
+                     {component_name: c.name, component_type: c.component_type}]
+    } AS details
+    UNION ALL
+    MATCH (c:Component)
+    WHERE c.id IS NOT NULL
+    RETURN 'components' AS kind, c.id AS id, {
+        component_name: c.name, component_type: c.component_type,
+        states: [(s:State)-[:HAS_COMPONENT]->(c) | s.name]
+    } AS details
+}
+RETURN kind, id, details
+"""
+
+# Default for the "Max nodes" control
+DEFAULT_MAX_NODES = 500
+
+# Component type icons for the state details list
+COMPONENT_ICONS = {
+    'button': '🔴', 'input': '🔵',
+    'navigation': '🟣', 'display': '🟢'
+}
+
+# Action edge colors by relationship type
+ACTION_EDGE_COLORS = {
+    'TAP': settings.ui.primary_color,
+    'SWIPE': settings.ui.secondary_color,
+    'SCROLL': settings.ui.text_color,
+    'TYPE': settings.ui.primary_color
+}
+
+# Styling passed to GRAPH_DATA_QUERY: states are Razzmatazz, components Splash
+GRAPH_STYLE_PARAMS = {
+    "state_color": settings.ui.primary_color,
+    "component_color": settings.ui.secondary_color,
+    "text_color": settings.ui.text_color,
+    "action_colors": ACTION_EDGE_COLORS
+}
+
+# Row cap added to ad-hoc Cypher queries that have no LIMIT of their own
+CYPHER_RESULT_LIMIT = 1000
+# Server-side transaction timeout for ad-hoc Cypher queries, in seconds
+CYPHER_QUERY_TIMEOUT = 10
+RETURN_PATTERN = re.compile(r'\bRETURN\b', re.IGNORECASE)
+LIMIT_PATTERN = re.compile(r'\bLIMIT\b', re.IGNORECASE)
+
+# Above this many nodes the layout skips force-directed physics
+PHYSICS_NODE_LIMIT = 200
+
+# Node counts are rounded up to a multiple of this for Config caching
+NODE_COUNT_BUCKET = 25
+
+@functools.lru_cache(maxsize=32)
+def _build_graph_config(layout_type: str, node_physics: bool, node_count: int) -> Config:
+    """
+    Build the agraph Config, memoized per control combination and size
+    
+    Force-directed physics is quadratic in the node count, so above
+    PHYSICS_NODE_LIMIT nodes it is switched off in favour of a directed
+    hierarchical layout.
+    """
+    use_physics = node_physics and node_count <= PHYSICS_NODE_LIMIT
+    
+    base_config = {
+        "width": 1000,
+        "height": 700,
+        "directed": True,
+        "hierarchical": layout_type == "hierarchical",
+        "nodeHighlightBehavior": True,
+        "highlightColor": settings.ui.secondary_color,
+        "collapsible": False,
+        "backgroundColor": settings.ui.background_color
+    }
+    
+    if node_count > PHYSICS_NODE_LIMIT:
+        base_config["hierarchical"] = True
+        base_config["layout"] = {"hierarchical": {"enabled": True, "sortMethod": "directed"}}
+    
+    if use_physics:
+        base_config.update({
+            "physics": {
+                "enabled": True,
+                "forceAtlas2Based": {
+                    "gravitationalConstant": -26,
+                    "centralGravity": 0.005,
+                    "springLength": 230,
+                    "springConstant": 0.18,
+                    "damping": 0.15,
+                    "avoidOverlap": 1.5
+                },
+                "maxVelocity": 146,
+                "solver": "forceAtlas2Based",
+                "timestep": 0.35,
+                "stabilization": {"iterations": min(150, max(20, 2000 // node_count))}
+            }
+        })
+    else:
+        base_config["physics"] = False
+    
+    return Config(**base_config)
+
+@st.cache_resource(show_spinner=False)
+def _warm_up_query_plans(_kg, driver_id: int) -> bool:
+    """
+    EXPLAIN the explorer's queries once per driver
+    
+    Planning them up front fills Neo4j's query plan cache before the first
+    render. Best effort: failures are logged and not retried.
+    """
+    warmup_queries = (
+        (GRAPH_DATA_QUERY, {
+            **GRAPH_STYLE_PARAMS,
+            "show_components": True,
+            "show_transitions": True,
+            "max_nodes": DEFAULT_MAX_NODES
+        }),
+        (NODE_DETAILS_QUERY, {}),
+    )
+    
+    try:
+        with _kg.get_session(default_access_mode=READ_ACCESS) as session:
+            for query, params in warmup_queries:
+                session.run(f"EXPLAIN {query}", params).consume()
+        return True
+    
+    except Exception as e:
+        logger.warning(f"Query plan warmup failed: {e}")
+        return False
+
 class KnowledgeGraphPage:
     """Handles the Knowledge Graph Explorer tab functionality"""
     
@@ -21,6 +217,8 @@ class KnowledgeGraphPage:
         UIComponents.render_section_header("Interactive Knowledge Graph")
         
         if SessionManager.is_connected():
+            kg = SessionManager.get('kg')
+            _warm_up_query_plans(kg, id(kg.driver))
             KnowledgeGraphPage._render_graph_interface()
         else:
             UIComponents.render_error_message("Cannot visualize graph without Neo4j connection")
@@ -28,8 +226,9 @@ class KnowledgeGraphPage:
         KnowledgeGraphPage._render_cypher_query_interface()
     
     @staticmethod
+    @st.fragment
     def _render_graph_interface():
-        """Render the graph visualization interface"""
+        """Render the graph visualization interface (reruns independently of the page)"""
         col1, col2 = st.columns([3, 1])
         
         with col2:
@@ -46,7 +245,7 @@ class KnowledgeGraphPage:
         # Refresh button
         if st.button("🔄 Refresh Graph", help="Reload graph data from Neo4j", key="refresh_graph"):
             KnowledgeGraphPage._clear_graph_cache()
-            st.rerun()
+            st.rerun(scope="fragment")
         
         # Control options
         controls = {
@@ -63,275 +262,199 @@ class KnowledgeGraphPage:
                                       key="layout_type"),
             'node_physics': st.checkbox("Enable Physics", value=True,
                                       help="Allow nodes to move and stabilize automatically",
-                                      key="node_physics")
+                                      key="node_physics"),
+            'max_nodes': st.number_input("Max nodes", min_value=10, value=DEFAULT_MAX_NODES, step=50,
+                                       help="Show only the most connected nodes",
+                                       key="max_nodes")
         }
         
         return controls
     
     @staticmethod
-    @cached_function(ttl=300)  # Cache for 5 minutes
-    def _get_knowledge_graph_data() -> Tuple[List[Node], List[Edge]]:
-        """Get knowledge graph data with caching"""
-        return KnowledgeGraphPage._fetch_graph_data()
+    @st.cache_data(ttl=300, show_spinner=False)  # Cache for 5 minutes
+    def _get_knowledge_graph_data(show_components: bool, show_transitions: bool, max_nodes: int) -> Tuple[List[dict], List[dict], Set[str], Set[str]]:
+        """
+        Get knowledge graph data with caching
+        
+        Shared by all sessions, with one entry per control combination. Errors
+        propagate so a failed fetch is not cached.
+        """
+        return KnowledgeGraphPage._fetch_graph_data(show_components, show_transitions, max_nodes)
     
     @staticmethod
-    def _fetch_graph_data() -> Tuple[List[Node], List[Edge]]:
-        """Fetch graph data from Neo4j"""
+    def _fetch_graph_data(show_components: bool, show_transitions: bool, max_nodes: int) -> Tuple[List[dict], List[dict], Set[str], Set[str]]:
+        """
+        Fetch the requested subset of the graph from Neo4j
+        
+        Nodes and edges are plain dicts of Node/Edge keyword arguments built
+        by Neo4j, which are cheap to cache; the agraph objects are built at
+        render time.
+        
+        Returns:
+            Tuple of (nodes, edges, state_ids, component_ids)
+        """
         nodes = []
         edges = []
+        state_ids = set()
+        component_ids = set()
         
         kg = SessionManager.get('kg')
         if not kg:
-            return nodes, edges
+            return nodes, edges, state_ids, component_ids
         
-        try:
-            with kg.get_session() as session:
-                # Get all states (Razzmatazz colored nodes)
-                result = session.run("MATCH (s:State) RETURN s.name as name ORDER BY s.name")
-                states = [record['name'] for record in result]
-                
-                # Create state nodes
-                for state_name in states:
-                    nodes.append(Node(
-                        id=state_name,
-                        label=state_name.replace('Page', '\nPage'),
-                        size=30,
-                        color=settings.ui.primary_color,
-                        shape='dot',
-                        font={'color': settings.ui.text_color}
-                    ))
-                
-                # Get all unique components (Splash colored nodes)
-                result = session.run("""
-                    MATCH (c:Component) 
-                    RETURN DISTINCT c.id as id, c.name as name, c.component_type as type 
-                    ORDER BY c.name
-                """)
-                components = list(result)
-                
-                for comp_record in components:
-                    comp_id = comp_record['id'] 
-                    comp_name = comp_record['name']
-                    
-                    if comp_name and comp_id:
-                        nodes.append(Node(
-                            id=comp_id,
-                            label=comp_name,
-                            size=20,
-                            color=settings.ui.secondary_color,
-                            shape='dot',
-                            font={'color': settings.ui.text_color}
-                        ))
-                
-                # Get HAS_COMPONENT relationships
-                result = session.run("""
-                    MATCH (s:State)-[:HAS_COMPONENT]->(c:Component)
-                    RETURN s.name as state_name, c.id as component_id
-                """)
-                
-                for record in result:
-                    state_name = record['state_name']
-                    component_id = record['component_id']
-                    
-                    if component_id:
-                        edges.append(Edge(
-                            source=state_name,
-                            target=component_id,
-                            color=settings.ui.text_color,
-                            width=1
-                        ))
-                
-                # Get action relationships
-                result = session.run("""
-                    MATCH (c:Component)-[r]->(s:State)
-                    WHERE type(r) IN ['TAP', 'SWIPE', 'SCROLL', 'TYPE']
-                    RETURN c.id as component_id, type(r) as action_type, s.name as target_state
-                """)
-                
-                for record in result:
-                    component_id = record['component_id']
-                    action_type = record['action_type']
-                    target_state = record['target_state']
-                    
-                    if component_id:
-                        edge_color = {
-                            'TAP': settings.ui.primary_color,
-                            'SWIPE': settings.ui.secondary_color,
-                            'SCROLL': settings.ui.text_color,
-                            'TYPE': settings.ui.primary_color
-                        }.get(action_type, settings.ui.text_color)
-                        
-                        edges.append(Edge(
-                            source=component_id,
-                            target=target_state,
-                            label=action_type,
-                            color=edge_color,
-                            width=2
-                        ))
-                        
-        except Exception as e:
-            logger.error(f"Error retrieving graph data: {e}")
-            UIComponents.render_error_message("Error loading graph data", str(e))
+        with kg.get_session(default_access_mode=READ_ACCESS) as session:
+            # One round trip; rows are tagged with their kind
+            result = session.run(GRAPH_DATA_QUERY, {
+                **GRAPH_STYLE_PARAMS,
+                "show_components": show_components,
+                "show_transitions": show_transitions,
+                "max_nodes": max_nodes
+            })
+            
+            # Stream records straight off the cursor; each unpacks to (kind, item)
+            for kind, item in result:
+                if kind == 'state':
+                    state_ids.add(item['id'])
+                    nodes.append(item)
+                elif kind == 'component':
+                    component_ids.add(item['id'])
+                    nodes.append(item)
+                else:
+                    edges.append(item)
         
-        return nodes, edges
+        return nodes, edges, state_ids, component_ids
     
     @staticmethod
     def _render_graph_visualization(controls: dict):
         """Render the interactive graph visualization"""
         with UIComponents.render_loading_spinner("Loading knowledge graph..."):
-            nodes, edges = KnowledgeGraphPage._get_knowledge_graph_data()
+            try:
+                node_data, edge_data, state_ids, component_ids = KnowledgeGraphPage._get_knowledge_graph_data(
+                    controls['show_components'],
+                    controls['show_state_transitions'],
+                    int(controls['max_nodes'])
+                )
+            except Exception as e:
+                logger.error(f"Error retrieving graph data: {e}")
+                UIComponents.render_error_message("Error loading graph data", str(e))
+                return
             
-            if not nodes:
+            if not node_data:
                 st.warning("No graph data available to visualize")
                 return
             
-            # Apply filters
-            if not controls['show_components']:
-                state_nodes = [n for n in nodes if 'Page' in n.id]
-                state_edges = [e for e in edges if 'Page' in e.source and 'Page' in e.target]
-                nodes, edges = state_nodes, state_edges
-            
-            if not controls['show_state_transitions']:
-                edges = [e for e in edges if not hasattr(e, 'label') or e.label == '' or e.width == 1]
+            nodes = [Node(**node) for node in node_data]
+            edges = [Edge(**edge) for edge in edge_data]
             
             # Configure graph
-            config = KnowledgeGraphPage._get_graph_config(controls)
+            config = KnowledgeGraphPage._get_graph_config(controls, len(nodes))
             
             # Display graph
             selected_node = agraph(nodes=nodes, edges=edges, config=config)
             
             # Show statistics
-            KnowledgeGraphPage._render_graph_statistics(nodes, edges)
+            KnowledgeGraphPage._render_graph_statistics(state_ids, component_ids, edges)
             
             # Show selected node info
             if selected_node:
-                KnowledgeGraphPage._render_node_details(selected_node)
+                KnowledgeGraphPage._render_node_details(selected_node, state_ids)
     
     @staticmethod
-    def _get_graph_config(controls: dict) -> Config:
+    def _get_graph_config(controls: dict, node_count: int) -> Config:
         """Get graph configuration based on controls"""
-        base_config = {
-            "width": 1000,
-            "height": 700,
-            "directed": True,
-            "hierarchical": controls['layout_type'] == "hierarchical",
-            "nodeHighlightBehavior": True,
-            "highlightColor": settings.ui.secondary_color,
-            "collapsible": False,
-            "backgroundColor": settings.ui.background_color
-        }
-        
-        if controls['node_physics']:
-            base_config.update({
-                "physics": {
-                    "enabled": True,
-                    "forceAtlas2Based": {
-                        "gravitationalConstant": -26,
-                        "centralGravity": 0.005,
-                        "springLength": 230,
-                        "springConstant": 0.18,
-                        "damping": 0.15,
-                        "avoidOverlap": 1.5
-                    },
-                    "maxVelocity": 146,
-                    "solver": "forceAtlas2Based",
-                    "timestep": 0.35,
-                    "stabilization": {"iterations": 150}
-                }
-            })
-        else:
-            base_config["physics"] = False
-        
-        return Config(**base_config)
+        # Round the node count up so similar graph sizes share a Config
+        node_count_bucket = -(-max(node_count, 1) // NODE_COUNT_BUCKET) * NODE_COUNT_BUCKET
+        return _build_graph_config(controls['layout_type'], controls['node_physics'], node_count_bucket)
     
     @staticmethod
-    def _render_graph_statistics(nodes: List[Node], edges: List[Edge]):
+    def _render_graph_statistics(state_ids: Set[str], component_ids: Set[str], edges: List[Edge]):
         """Render graph statistics"""
         st.markdown("---")
         col_stats1, col_stats2, col_stats3 = st.columns(3)
         
         with col_stats1:
-            states_count = len([n for n in nodes if 'Page' in n.id])
-            st.metric("States", states_count)
+            st.metric("States", len(state_ids))
         
         with col_stats2:
-            components_count = len([n for n in nodes if 'Page' not in n.id])
-            st.metric("Components", components_count)
+            st.metric("Components", len(component_ids))
         
         with col_stats3:
             st.metric("Relationships", len(edges))
     
     @staticmethod
-    def _render_node_details(selected_node: str):
-        """Render details for selected node"""
-        st.subheader(f"Selected: {selected_node}")
+    @st.cache_data(ttl=300, show_spinner=False)  # Cache for 5 minutes
+    def _get_node_details() -> Dict[str, Dict[str, dict]]:
+        """
+        Get the details of every state and component with caching
+        
+        Loaded on the first node click and shared by all sessions, so later
+        clicks are dictionary lookups instead of Neo4j round trips.
+        
+        Returns:
+            Dict with 'states' and 'components', each keyed by node id
+        """
+        details = {'states': {}, 'components': {}}
         
         kg = SessionManager.get('kg')
         if not kg:
-            return
+            return details
+        
+        with kg.get_session(default_access_mode=READ_ACCESS) as session:
+            for kind, node_id, node_details in session.run(NODE_DETAILS_QUERY):
+                details[kind][node_id] = node_details
+        
+        return details
+    
+    @staticmethod
+    def _render_node_details(selected_node: str, state_ids: Set[str]):
+        """Render details for selected node"""
+        st.subheader(f"Selected: {selected_node}")
         
         try:
-            with kg.get_session() as session:
-                if 'Page' in selected_node:
-                    # This is a state
-                    KnowledgeGraphPage._render_state_details(session, selected_node)
-                else:
-                    # This is a component
-                    KnowledgeGraphPage._render_component_details(session, selected_node)
-                    
+            details = KnowledgeGraphPage._get_node_details()
         except Exception as e:
             logger.error(f"Error getting node details: {e}")
             UIComponents.render_error_message("Error loading node details", str(e))
+            return
+        
+        if selected_node in state_ids:
+            # This is a state
+            KnowledgeGraphPage._render_state_details(selected_node, details['states'].get(selected_node))
+        else:
+            # This is a component
+            KnowledgeGraphPage._render_component_details(selected_node, details['components'].get(selected_node))
     
     @staticmethod
-    def _render_state_details(session, state_name: str):
+    def _render_state_details(state_name: str, state_info: Optional[dict]):
         """Render state details"""
         st.info(f"🏠 State: **{state_name}**")
         
-        result = session.run("""
-            MATCH (s:State {name: $state_name})-[:HAS_COMPONENT]->(c:Component)
-            RETURN c.name as component_name, c.component_type as component_type
-        """, {"state_name": state_name})
-        
-        components = list(result)
+        components = state_info['components'] if state_info else []
         if components:
             st.markdown("**Available Components:**")
             for comp in components:
-                comp_type_icon = {
-                    'button': '🔴', 'input': '🔵', 
-                    'navigation': '🟣', 'display': '🟢'
-                }.get(comp['component_type'], '⚪')
+                comp_type_icon = COMPONENT_ICONS.get(comp['component_type'], '⚪')
                 st.markdown(f"- {comp_type_icon} **{comp['component_name']}** ({comp['component_type']})")
     
     @staticmethod
-    def _render_component_details(session, component_id: str):
+    def _render_component_details(component_id: str, comp_info: Optional[dict]):
         """Render component details"""
-        result = session.run("""
-            MATCH (c:Component {id: $component_id})
-            RETURN c.name as component_name, c.component_type as component_type
-        """, {"component_id": component_id})
-        
-        comp_info = result.single()
         if comp_info:
             comp_name = comp_info['component_name']
             comp_type = comp_info['component_type']
             st.info(f"🔧 Component: **{comp_name}** ({comp_type})")
             
             # Show states containing this component
-            result = session.run("""
-                MATCH (s:State)-[:HAS_COMPONENT]->(c:Component {id: $component_id})
-                RETURN s.name as state_name
-            """, {"component_id": component_id})
-            
-            states = [record['state_name'] for record in result]
+            states = comp_info['states']
             if states:
                 st.markdown("**Found in States:**")
                 for state in states:
                     st.markdown(f"- 🏠 {state}")
     
     @staticmethod
+    @st.fragment
     def _render_cypher_query_interface():
-        """Render the Cypher query interface"""
+        """Render the Cypher query interface (reruns independently of the page)"""
         st.markdown("---")
         UIComponents.render_subsection_header("🔍 Cypher Query", settings.ui.text_color)
         
@@ -349,13 +472,13 @@ class KnowledgeGraphPage:
             st.markdown("**Quick Queries:**")
             if st.button("All States", key="query_states"):
                 st.session_state.cypher_query = "MATCH (s:State) RETURN s.name ORDER BY s.name"
-                st.rerun()
+                st.rerun(scope="fragment")
             if st.button("All Components", key="query_components"):
                 st.session_state.cypher_query = "MATCH (c:Component) RETURN c.name, c.component_type"
-                st.rerun()
+                st.rerun(scope="fragment")
             if st.button("Action Paths", key="query_actions"):
                 st.session_state.cypher_query = "MATCH (c:Component)-[r]->(s:State) RETURN c.name, type(r), s.name LIMIT 20"
-                st.rerun()
+                st.rerun(scope="fragment")
         
         if st.button("Execute Query", key="execute_query"):
             KnowledgeGraphPage._execute_cypher_query(cypher_query)
@@ -368,24 +491,41 @@ class KnowledgeGraphPage:
             UIComponents.render_error_message("No database connection available")
             return
         
+        # Bound the rows sent to the browser for queries without their own LIMIT
+        query = query.strip().rstrip(';')
+        if RETURN_PATTERN.search(query) and not LIMIT_PATTERN.search(query):
+            query = f"{query}\nLIMIT {CYPHER_RESULT_LIMIT}"
+            st.caption(f"No LIMIT given; showing at most {CYPHER_RESULT_LIMIT} rows")
+        
+        # Read-only, server-side timeout; transient failures are retried
+        @unit_of_work(timeout=CYPHER_QUERY_TIMEOUT)
+        def read_query(tx):
+            # Columnar DataFrame straight from the driver, no per-record dicts
+            return tx.run(query).to_df()
+        
         with UIComponents.render_loading_spinner("Querying Neo4j..."):
             try:
-                with kg.get_session() as session:
-                    result = session.run(query)
-                    data = [dict(record) for record in result]
-                    
-                    if data:
-                        st.dataframe(data, use_container_width=True)
-                    else:
-                        st.info("Query returned no results")
+                with kg.get_session(default_access_mode=READ_ACCESS) as session:
+                    df = session.execute_read(read_query)
+                
+                if not df.empty:
+                    st.dataframe(df, use_container_width=True)
+                else:
+                    st.info("Query returned no results")
                         
+            except ClientError as e:
+                if e.code and 'TransactionTimedOut' in e.code:
+                    UIComponents.render_error_message(
+                        "Query timed out", f"Stopped after {CYPHER_QUERY_TIMEOUT} seconds"
+                    )
+                else:
+                    UIComponents.render_error_message("Query error", str(e))
             except Exception as e:
                 UIComponents.render_error_message("Query error", str(e))
     
     @staticmethod
     def _clear_graph_cache():
         """Clear graph data cache"""
-        # Clear the cached function results
-        if hasattr(st.session_state, 'cache_get_knowledge_graph_data'):
-            delattr(st.session_state, 'cache_get_knowledge_graph_data')
+        KnowledgeGraphPage._get_knowledge_graph_data.clear()
+        KnowledgeGraphPage._get_node_details.clear()
         logger.info("Cleared graph data cache")
\ No newline at end of file
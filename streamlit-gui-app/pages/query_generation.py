@@ -3,6 +3,7 @@ Query and Test Generation page module
 """
 
 import streamlit as st
+from typing import List, Tuple
 from utils.ui_components import UIComponents
 from utils.session_manager import SessionManager
 from services.scenario_service import ScenarioService
@@ -11,6 +12,27 @@ from utils.status_monitor import StreamlitStatusMonitor
 from utils.caching import PerformanceMonitor
 from utils.logging_config import logger
 
+# Default starting states, in display order; HomePage is the default choice
+START_STATES = (
+    "HomePage", "ForYouPage", "STEMPage", "ExplorePage",
+    "FollowingPage", "FriendsPage", "ProfilePage", "SettingsPage"
+)
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _query_state_names(_kg, driver_id: int) -> List[str]:
+    """Read the State names from Neo4j (cached across sessions; errors are not cached)"""
+    with _kg.get_session() as session:
+        return [record['name'] for record in session.run("MATCH (s:State) RETURN s.name as name ORDER BY name")]
+
+# Static HTML for the results section
+FLOW_ARROW_HTML = "<div style='text-align: center; color: #FE2C55; font-size: 20px; margin: 10px 0;'>⬇️</div>"
+EXECUTION_HEADER_HTML = (
+    "---\n\n"
+    "<div style='color: #25F4EE; font-size: 20px; font-weight: bold; margin: 20px 0;'>"
+    "🚀 Execute Automation Testing"
+    "</div>"
+)
+
 class QueryGenerationPage:
     """Handles the Query & Test Generation tab functionality"""
     
@@ -20,15 +42,43 @@ class QueryGenerationPage:
         """Render the complete query generation page"""
         UIComponents.render_section_header("Generate Test Steps from Natural Language")
         
+        # Both starting state selectors share one options tuple
+        start_states = QueryGenerationPage._get_start_states()
+        
         # Query input section
-        QueryGenerationPage._render_query_input()
+        QueryGenerationPage._render_query_input(start_states)
         
         # Results section
         if SessionManager.has_current_plan():
-            QueryGenerationPage._render_results()
+            QueryGenerationPage._render_results(start_states)
+    
+    @staticmethod
+    def _get_start_states() -> Tuple[str, ...]:
+        """
+        Starting state options, taken from the knowledge graph when available
+        
+        Known states keep their START_STATES order, followed by any other
+        states in the graph. Falls back to START_STATES without a connection.
+        """
+        kg = SessionManager.get('kg')
+        if not kg:
+            return START_STATES
+        
+        try:
+            state_names = _query_state_names(kg, id(kg.driver))
+        except Exception as e:
+            logger.warning(f"Could not load states from knowledge graph: {e}")
+            return START_STATES
+        
+        if not state_names:
+            return START_STATES
+        
+        available = set(state_names)
+        known = tuple(state for state in START_STATES if state in available)
+        return known + tuple(state for state in state_names if state not in START_STATES)
     
     @staticmethod
-    def _render_query_input():
+    def _render_query_input(start_states: Tuple[str, ...]):
         """Render the query input section"""
         col1, col2 = st.columns([3, 1])
         
@@ -44,8 +94,7 @@ class QueryGenerationPage:
         with col2:
             start_state = st.selectbox(
                 "Starting State:",
-                options=["HomePage", "ForYouPage", "STEMPage", "ExplorePage", 
-                        "FollowingPage", "FriendsPage", "ProfilePage", "SettingsPage"],
+                options=start_states,
                 help="Select where the user begins their journey",
                 key="start_state_input"
             )
@@ -132,51 +181,36 @@ class QueryGenerationPage:
                 UIComponents.render_error_message("Database connectivity test failed", str(conn_e))
     
     @staticmethod
-    def _render_results():
+    def _render_results(start_states: Tuple[str, ...]):
         """Render the test generation results"""
         current_plan = SessionManager.get('current_plan')
         if not current_plan or not current_plan.steps:
             return
         
-        # Test Plan header
-        st.markdown(f"""
-        <div style='color: #FE2C55; font-size: 24px; font-weight: bold; margin: 20px 0;'>
-            📋 Test Plan: <span style='color: #FFFFFF;'>{current_plan.scenario_title}</span>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        # Steps container
-        st.markdown("""
-        <div style='background-color: #1a1a1a; padding: 20px; border-radius: 10px; border: 2px solid #25F4EE; margin: 20px 0;'>
-        """, unsafe_allow_html=True)
-        
-        # Render each step
-        for i, step in enumerate(current_plan.steps):
-            UIComponents.render_step_card(step, i)
-            
-            # Add flow arrow except for last step
-            if i < len(current_plan.steps) - 1:
-                st.markdown(
-                    "<div style='text-align: center; color: #FE2C55; font-size: 20px; margin: 10px 0;'>⬇️</div>", 
-                    unsafe_allow_html=True
-                )
-        
-        st.markdown("</div>", unsafe_allow_html=True)
+        # Header, steps and flow arrows as a single element, so the container
+        # div actually wraps the step cards
+        step_html = FLOW_ARROW_HTML.join(
+            UIComponents.build_step_card_html(step, i).strip()
+            for i, step in enumerate(current_plan.steps)
+        )
+        st.markdown(
+            f"<div style='color: #FE2C55; font-size: 24px; font-weight: bold; margin: 20px 0;'>"
+            f"📋 Test Plan: <span style='color: #FFFFFF;'>{current_plan.scenario_title}</span>"
+            f"</div>"
+            f"<div style='background-color: #1a1a1a; padding: 20px; border-radius: 10px; border: 2px solid #25F4EE; margin: 20px 0;'>"
+            f"{step_html}"
+            f"</div>",
+            unsafe_allow_html=True
+        )
         
         # Add execution controls
-        QueryGenerationPage._render_execution_controls(current_plan)
+        QueryGenerationPage._render_execution_controls(current_plan, start_states)
     
     @staticmethod
-    def _render_execution_controls(current_plan):
+    def _render_execution_controls(current_plan, start_states: Tuple[str, ...]):
         """Render automation execution controls and monitoring UI"""
-        st.markdown("---")
-        
-        # Execution section header
-        st.markdown("""
-        <div style='color: #25F4EE; font-size: 20px; font-weight: bold; margin: 20px 0;'>
-            🚀 Execute Automation Testing
-        </div>
-        """, unsafe_allow_html=True)
+        # Divider and execution section header
+        st.markdown(EXECUTION_HEADER_HTML, unsafe_allow_html=True)
         
         # Check automation service health
         col1, col2, col3 = st.columns([1, 1, 1])
@@ -193,8 +227,7 @@ class QueryGenerationPage:
         with col2:
             start_state = st.selectbox(
                 "Starting State:",
-                options=["HomePage", "ForYouPage", "STEMPage", "ExplorePage", 
-                        "FollowingPage", "FriendsPage", "ProfilePage", "SettingsPage"],
+                options=start_states,
                 key="execution_start_state"
             )
         
@@ -4,13 +4,39 @@ Scenario Management page module
 
 import streamlit as st
 import json
-from typing import List, Dict, Any
+import itertools
+import re
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from utils.ui_components import UIComponents
 from utils.session_manager import SessionManager
 from services.scenario_service import ScenarioService
 from utils.caching import PerformanceMonitor, get_scenarios_with_cache
 from utils.logging_config import logger
 
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Errors raised for a malformed upload: json.JSONDecodeError and
+# orjson.JSONDecodeError are ValueErrors, ijson.JSONError is not
+JSON_DECODE_ERRORS = (ValueError, ijson.JSONError) if ijson is not None else (ValueError,)
+
+# Separator for the comma-separated scenario form fields, surrounding spaces included
+CSV_FIELD_SEPARATOR = re.compile(r"\s*,\s*")
+
+def _split_csv(value: str) -> List[str]:
+    """Split a comma-separated form field into its non-empty, stripped items"""
+    return [item for item in CSV_FIELD_SEPARATOR.split(value.strip()) if item]
+
+# Characters of each scenario shown in the import preview
+PREVIEW_MAX_CHARS = 500
+
 class ScenarioManagementPage:
     """Handles the Scenario Management tab functionality"""
     
@@ -37,6 +63,7 @@ class ScenarioManagementPage:
             ScenarioManagementPage._render_import_export()
     
     @staticmethod
+    @st.fragment
     def _render_browse_scenarios():
         """Render the browse scenarios tab"""
         UIComponents.render_subsection_header("📚 Browse Existing Scenarios")
@@ -50,15 +77,19 @@ class ScenarioManagementPage:
             filter_options = get_scenarios_with_cache()
             
             # Render filter controls
-            filters = ScenarioManagementPage._render_scenario_filters(filter_options)
+            filters, submitted = ScenarioManagementPage._render_scenario_filters(filter_options)
             
-            # Search and filter scenarios
-            scenarios = ScenarioService.search_scenarios(
-                feature_filter=filters['feature'],
-                type_filter=filters['type'],
-                tag_filter=filters['tag'],
-                search_query=filters['search']
-            )
+            # Only re-filter when the form is submitted (or nothing is cached yet)
+            if submitted or SessionManager.get('scenario_search_results') is None:
+                scenarios = ScenarioService.search_scenarios(
+                    feature_filter=filters['feature'],
+                    type_filter=filters['type'],
+                    tag_filter=filters['tag'],
+                    search_query=filters['search']
+                )
+                SessionManager.set('scenario_search_results', scenarios)
+            else:
+                scenarios = SessionManager.get('scenario_search_results')
             
             st.markdown(f"**Found {len(scenarios)} scenarios**")
             
@@ -69,47 +100,51 @@ class ScenarioManagementPage:
                 st.info("No scenarios found matching your filters.")
                 
         except Exception as e:
-            logger.error(f"Error loading scenarios: {e}")
+            logger.error("Error loading scenarios: %s", e)
             UIComponents.render_error_message("Error loading scenarios", str(e))
     
     @staticmethod
-    def _render_scenario_filters(filter_options: Dict[str, List[str]]) -> Dict[str, str]:
-        """Render scenario filter controls"""
-        col_filter1, col_filter2, col_filter3 = st.columns(3)
-        
-        with col_filter1:
-            selected_feature = st.selectbox(
-                "Filter by Feature:", 
-                ["All"] + filter_options.get("features", []),
-                key="scenario_feature_filter"
-            )
-        
-        with col_filter2:
-            selected_type = st.selectbox(
-                "Filter by Type:", 
-                ["All"] + filter_options.get("types", []),
-                key="scenario_type_filter"
-            )
-        
-        with col_filter3:
-            selected_tag = st.selectbox(
-                "Filter by Tag:", 
-                ["All"] + filter_options.get("tags", []),
-                key="scenario_tag_filter"
+    def _render_scenario_filters(filter_options: Dict[str, List[str]]) -> Tuple[Dict[str, str], bool]:
+        """Render scenario filter controls inside a form so typing doesn't re-filter"""
+        with st.form("scenario_filters", clear_on_submit=False):
+            col_filter1, col_filter2, col_filter3 = st.columns(3)
+            
+            with col_filter1:
+                selected_feature = st.selectbox(
+                    "Filter by Feature:", 
+                    ["All"] + filter_options.get("features", []),
+                    key="scenario_feature_filter"
+                )
+            
+            with col_filter2:
+                selected_type = st.selectbox(
+                    "Filter by Type:", 
+                    ["All"] + filter_options.get("types", []),
+                    key="scenario_type_filter"
+                )
+            
+            with col_filter3:
+                selected_tag = st.selectbox(
+                    "Filter by Tag:", 
+                    ["All"] + filter_options.get("tags", []),
+                    key="scenario_tag_filter"
+                )
+            
+            search_query = st.text_input(
+                "🔍 Search scenarios:", 
+                placeholder="Search by title, feature, or goal...",
+                key="scenario_search"
             )
+            
+            submitted = st.form_submit_button("🔍 Apply Filters")
         
-        search_query = st.text_input(
-            "🔍 Search scenarios:", 
-            placeholder="Search by title, feature, or goal...",
-            key="scenario_search"
-        )
-        
-        return {
+        filters = {
             'feature': selected_feature,
             'type': selected_type,
             'tag': selected_tag,
             'search': search_query
         }
+        return filters, submitted
     
     @staticmethod
     def _render_scenario_list(scenarios: List[Any]):
@@ -119,6 +154,7 @@ class ScenarioManagementPage:
                 UIComponents.render_scenario_card(scenario, i)
     
     @staticmethod
+    @st.fragment
     def _render_add_scenario():
         """Render the add new scenario tab"""
         UIComponents.render_subsection_header("➕ Add New Business Scenario")
@@ -212,10 +248,10 @@ class ScenarioManagementPage:
                 'feature': scenario_data['feature'],
                 'goal': scenario_data['goal'],
                 'scenario_type': scenario_data['type'],
-                'given_conditions': [g.strip() for g in scenario_data['given'].split(',') if g.strip()],
-                'when_actions': [w.strip() for w in scenario_data['when'].split(',') if w.strip()],
-                'then_expectations': [t.strip() for t in scenario_data['then'].split(',') if t.strip()],
-                'tags': [tag.strip() for tag in scenario_data['tags'].split(',') if tag.strip()]
+                'given_conditions': _split_csv(scenario_data['given']),
+                'when_actions': _split_csv(scenario_data['when']),
+                'then_expectations': _split_csv(scenario_data['then']),
+                'tags': _split_csv(scenario_data['tags'])
             }
             
             success, message = ScenarioService.create_scenario(processed_data)
@@ -226,10 +262,11 @@ class ScenarioManagementPage:
                 UIComponents.render_error_message(message)
                 
         except Exception as e:
-            logger.error(f"Error creating scenario: {e}")
+            logger.error("Error creating scenario: %s", e)
             UIComponents.render_error_message("Error creating scenario", str(e))
     
     @staticmethod
+    @st.fragment
     def _render_import_export():
         """Render the import/export tab"""
         UIComponents.render_subsection_header("📤 Import/Export Scenarios")
@@ -286,32 +323,76 @@ class ScenarioManagementPage:
     def _handle_import(uploaded_file):
         """Handle scenario import"""
         try:
-            file_content = uploaded_file.read()
-            scenarios_data = json.loads(file_content)
+            scenarios_iter = ScenarioManagementPage._iter_uploaded_scenarios(uploaded_file)
             
-            if isinstance(scenarios_data, list):
-                UIComponents.render_success_message(f"Found {len(scenarios_data)} scenarios in file")
+            if scenarios_iter is not None:
+                # Parse only the preview rows, then count the rest without keeping them
+                preview = list(itertools.islice(scenarios_iter, 3))
+                total = len(preview) + sum(1 for _ in scenarios_iter)
+                
+                UIComponents.render_success_message(f"Found {total} scenarios in file")
                 
                 # Preview first few scenarios
                 with st.expander("🔍 Preview Import Data"):
-                    for i, scenario_data in enumerate(scenarios_data[:3]):
-                        st.json(scenario_data)
-                        if i >= 2 and len(scenarios_data) > 3:
-                            st.info(f"... and {len(scenarios_data) - 3} more scenarios")
-                            break
+                    for scenario_data in preview:
+                        st.code(ScenarioManagementPage._preview_json(scenario_data), language="json")
+                    if total > 3:
+                        st.info(f"... and {total - 3} more scenarios")
                 
                 if st.button("📥 Import Scenarios", type="primary", key="import_confirm"):
-                    st.info("💡 Note: This is a demo. In production, scenarios would be imported to the database.")
-                    UIComponents.render_success_message("Import completed successfully!")
+                    with UIComponents.render_loading_spinner("Importing scenarios..."):
+                        success, message = ScenarioService.import_scenarios(
+                            ScenarioManagementPage._iter_uploaded_scenarios(uploaded_file)
+                        )
+                    
+                    if success:
+                        UIComponents.render_success_message(message)
+                    else:
+                        UIComponents.render_error_message(f"Import failed: {message}")
             else:
                 UIComponents.render_error_message("Invalid JSON format. Expected a list of scenarios.")
                 
-        except json.JSONDecodeError as e:
+        except JSON_DECODE_ERRORS as e:
             UIComponents.render_error_message("Invalid JSON file", str(e))
         except Exception as e:
-            logger.error(f"Import error: {e}")
+            logger.error("Import error: %s", e)
             UIComponents.render_error_message("Import failed", str(e))
     
+    @staticmethod
+    def _preview_json(scenario_data: Any, max_chars: int = PREVIEW_MAX_CHARS) -> str:
+        """Serialize a scenario compactly for the import preview, truncated to max_chars"""
+        if orjson is not None:
+            text = orjson.dumps(scenario_data).decode("utf-8")
+        else:
+            text = json.dumps(scenario_data, ensure_ascii=False)
+        return text if len(text) <= max_chars else text[:max_chars] + "…"
+    
+    @staticmethod
+    def _iter_uploaded_scenarios(uploaded_file) -> Optional[Iterator[Any]]:
+        """
+        Iterate the scenarios in an uploaded JSON array
+        
+        Streams with ijson when it is installed so only one scenario is
+        parsed at a time; otherwise falls back to a full parse with orjson
+        (or json when orjson is not installed either).
+        
+        Returns:
+            Iterator over scenario dicts, or None if the file is not a JSON list
+        """
+        uploaded_file.seek(0)
+        
+        if ijson is None:
+            raw = uploaded_file.getvalue()
+            scenarios_data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+            return iter(scenarios_data) if isinstance(scenarios_data, list) else None
+        
+        _, first_event, _ = next(ijson.parse(uploaded_file), (None, None, None))
+        if first_event != 'start_array':
+            return None
+        
+        uploaded_file.seek(0)
+        return ijson.items(uploaded_file, 'item', use_float=True)
+    
     @staticmethod
     def _render_statistics():
         """Render scenario statistics"""
@@ -322,28 +403,12 @@ class ScenarioManagementPage:
             
             if stats:
                 col_stat1, col_stat2, col_stat3 = st.columns(3)
-                
-                with col_stat1:
-                    UIComponents.render_metric_card(
-                        stats.get('total_scenarios', 0), 
-                        "Total Scenarios"
-                    )
-                
-                with col_stat2:
-                    UIComponents.render_metric_card(
-                        stats.get('features_covered', 0), 
-                        "Features Covered",
-                        color="#25F4EE"
-                    )
-                
-                with col_stat3:
-                    UIComponents.render_metric_card(
-                        stats.get('unique_tags', 0), 
-                        "Unique Tags"
-                    )
+                col_stat1.metric("Total Scenarios", stats.get('total_scenarios', 0))
+                col_stat2.metric("Features Covered", stats.get('features_covered', 0))
+                col_stat3.metric("Unique Tags", stats.get('unique_tags', 0))
             else:
                 st.info("No statistics available")
                 
         except Exception as e:
-            logger.error(f"Error loading statistics: {e}")
+            logger.error("Error loading statistics: %s", e)
             UIComponents.render_error_message("Error loading statistics", str(e))
\ No newline at end of file
@@ -1,9 +1,111 @@
 import requests
 import json
-from typing import Dict, Any, Tuple, Optional
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Dict, Any, List, Tuple, Optional
 from utils.logging_config import logger, ErrorContext
 from config.settings import settings
 
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Automation service endpoints; settings are fixed after startup
+RUN_URL = f"{settings.automation.base_url}/run"
+HEALTH_URL = f"{settings.automation.base_url}/health"
+STATUS_URL_TEMPLATE = settings.automation.base_url + "/status/{}"
+LOGS_URL_TEMPLATE = settings.automation.base_url + "/logs/{}"
+SCREENSHOT_URL_TEMPLATE = settings.automation.base_url + "/screenshot/{}"
+BUNDLE_URL_TEMPLATE = settings.automation.base_url + "/execution/{}/bundle"
+
+# Responses with a known size below this are parsed in one go; larger or
+# unsized (chunked) responses are stream-parsed with ijson
+STREAM_JSON_THRESHOLD = 64 * 1024
+
+# Concurrent status requests per batch in get_execution_statuses
+STATUS_BATCH_SIZE = 16
+
+# Shared default for steps without alternative actions
+NO_ALTERNATIVE_ACTIONS = ()
+
+# Shared HTTP session so calls to the automation service reuse pooled
+# keep-alive connections instead of reconnecting per request
+_http_session: Optional[requests.Session] = None
+_http_session_lock = threading.Lock()
+
+def get_http_session() -> requests.Session:
+    """Get the shared, lazily created automation service HTTP session"""
+    global _http_session
+    
+    if _http_session is None:
+        with _http_session_lock:
+            if _http_session is None:
+                # Only GETs (health, status, logs, screenshots) are retried on
+                # read errors and 5xx; POST /run must never run twice
+                retry = Retry(
+                    total=settings.automation.max_retries,
+                    backoff_factor=0.2,
+                    status_forcelist=[502, 503, 504],
+                    allowed_methods=frozenset({"GET"}),
+                    raise_on_status=False
+                )
+                adapter = HTTPAdapter(pool_connections=10, pool_maxsize=32, max_retries=retry)
+                
+                session = requests.Session()
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _http_session = session
+    
+    return _http_session
+
+# Separate session for status long polls: a read timeout there means the
+# server held the request too long, and retrying it would only hold the
+# Streamlit script thread longer
+_long_poll_session: Optional[requests.Session] = None
+
+def get_long_poll_session() -> requests.Session:
+    """Get the shared, lazily created session for status long polls (no read retries)"""
+    global _long_poll_session
+    
+    if _long_poll_session is None:
+        with _http_session_lock:
+            if _long_poll_session is None:
+                retry = Retry(
+                    total=settings.automation.max_retries,
+                    read=0,
+                    status=0,
+                    backoff_factor=0.2,
+                    allowed_methods=frozenset({"GET"}),
+                    raise_on_status=False
+                )
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=8, max_retries=retry)
+                
+                session = requests.Session()
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _long_poll_session = session
+    
+    return _long_poll_session
+
+def read_json_response(response: requests.Response) -> Any:
+    """Parse a streamed JSON response, incrementally when it is large or unsized"""
+    content_length = int(response.headers.get("Content-Length") or 0)
+    if ijson is None or 0 < content_length < STREAM_JSON_THRESHOLD:
+        return response.json()
+    
+    # Let urllib3 undo any gzip/deflate encoding while ijson reads
+    response.raw.decode_content = True
+    return next(ijson.items(response.raw, "", use_float=True))
+
 class AutomationService:
     """Service for triggering and monitoring test automation"""
     
@@ -28,15 +130,17 @@ class AutomationService:
                 payload = AutomationService._convert_scenario_to_payload(scenario_plan, start_state)
                 
                 # Get automation service URL
-                endpoint = f"{settings.automation.base_url}/run"
+                endpoint = RUN_URL
                 
-                logger.info(f"Triggering automation execution at {endpoint}")
-                logger.debug(f"Payload: {json.dumps(payload, indent=2)}")
+                logger.info("Triggering automation execution at %s", endpoint)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Payload: %s", json.dumps(payload))
                 
-                # Make API request
-                response = requests.post(
+                # Make API request; the body is serialized here rather than
+                # with json= so orjson can be used when it is installed
+                response = get_http_session().post(
                     endpoint,
-                    json=payload,
+                    data=AutomationService._dumps_payload(payload),
                     headers={"Content-Type": "application/json"},
                     timeout=settings.automation.timeout
                 )
@@ -69,6 +173,13 @@ class AutomationService:
             logger.error(error_msg)
             return False, error_msg, None
     
+    @staticmethod
+    def _dumps_payload(payload: Dict[str, Any]) -> bytes:
+        """Serialize a request payload to JSON bytes, with orjson when available"""
+        if orjson is not None:
+            return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(payload).encode("utf-8")
+    
     @staticmethod
     def _convert_scenario_to_payload(scenario_plan, start_state: str) -> Dict[str, Any]:
         """
@@ -85,21 +196,20 @@ class AutomationService:
             "scenario_id": scenario_plan.scenario_id,
             "scenario_title": scenario_plan.scenario_title,
             "start_state": start_state,
-            "steps": []
+            # Convert each ExecutorStep
+            "steps": [
+                {
+                    "step_id": step.step_id,
+                    "description": step.description,
+                    "action_type": step.action_type,
+                    "query_for_qwen": step.query_for_qwen,
+                    "alternative_actions": getattr(step, 'alternative_actions', NO_ALTERNATIVE_ACTIONS),
+                    "expected_state": step.expected_state
+                }
+                for step in scenario_plan.steps
+            ]
         }
         
-        # Convert each ExecutorStep
-        for step in scenario_plan.steps:
-            step_data = {
-                "step_id": step.step_id,
-                "description": step.description,
-                "action_type": step.action_type,
-                "query_for_qwen": step.query_for_qwen,
-                "alternative_actions": getattr(step, 'alternative_actions', []),
-                "expected_state": step.expected_state
-            }
-            payload["steps"].append(step_data)
-        
         # Add optional fields if they exist
         if hasattr(scenario_plan, 'preconditions'):
             payload["preconditions"] = scenario_plan.preconditions
@@ -119,9 +229,9 @@ class AutomationService:
             Tuple of (is_healthy, status_message)
         """
         try:
-            health_endpoint = f"{settings.automation.base_url}/health"
+            health_endpoint = HEALTH_URL
             
-            response = requests.get(health_endpoint, timeout=settings.automation.health_check_timeout)
+            response = get_http_session().get(health_endpoint, timeout=settings.automation.health_check_timeout)
             response.raise_for_status()
             
             return True, "🟢 Automation service is running"
@@ -145,17 +255,53 @@ class AutomationService:
             Tuple of (success, status_data)
         """
         try:
-            status_endpoint = f"{settings.automation.base_url}/status/{execution_id}"
-            
-            response = requests.get(status_endpoint, timeout=settings.automation.health_check_timeout)
-            response.raise_for_status()
+            status_endpoint = STATUS_URL_TEMPLATE.format(execution_id)
             
-            return True, response.json()
+            response = get_http_session().get(
+                status_endpoint,
+                stream=True,
+                timeout=settings.automation.health_check_timeout
+            )
+            try:
+                response.raise_for_status()
+                return True, read_json_response(response)
+            finally:
+                response.close()
             
         except Exception as e:
-            logger.error(f"Error getting execution status: {e}")
+            logger.error("Error getting execution status: %s", e)
             return False, {"error": str(e)}
     
+    @staticmethod
+    def get_execution_statuses(execution_ids: List[str], max_batch: int = STATUS_BATCH_SIZE) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the status of several executions concurrently
+        
+        Requests are issued in batches of max_batch over the shared HTTP
+        session, so N statuses take about N / max_batch round trips.
+        
+        Args:
+            execution_ids: IDs of the executions to check
+            max_batch: Maximum number of requests in flight at once
+            
+        Returns:
+            Dict of execution_id -> status_data ({"error": ...} on failure)
+        """
+        unique_ids = list(dict.fromkeys(execution_ids))
+        if not unique_ids:
+            return {}
+        
+        statuses = {}
+        with ThreadPoolExecutor(max_workers=min(max_batch, len(unique_ids))) as executor:
+            for start in range(0, len(unique_ids), max_batch):
+                batch = unique_ids[start:start + max_batch]
+                for execution_id, (_, status_data) in zip(
+                    batch, executor.map(AutomationService.get_execution_status, batch)
+                ):
+                    statuses[execution_id] = status_data
+        
+        return statuses
+    
     @staticmethod
     def get_execution_logs(execution_id: str) -> Tuple[bool, str]:
         """
@@ -168,9 +314,9 @@ class AutomationService:
             Tuple of (success, logs_content)
         """
         try:
-            logs_endpoint = f"{settings.automation.base_url}/logs/{execution_id}"
+            logs_endpoint = LOGS_URL_TEMPLATE.format(execution_id)
             
-            response = requests.get(
+            response = get_http_session().get(
                 logs_endpoint,
                 timeout=settings.automation.timeout
             )
@@ -179,7 +325,7 @@ class AutomationService:
             return True, response.text
             
         except Exception as e:
-            logger.error(f"Error getting execution logs: {e}")
+            logger.error("Error getting execution logs: %s", e)
             return False, f"Error retrieving logs: {str(e)}"
     
     @staticmethod
@@ -194,9 +340,9 @@ class AutomationService:
             Tuple of (success, screenshot_bytes)
         """
         try:
-            screenshot_endpoint = f"{settings.automation.base_url}/screenshot/{execution_id}"
+            screenshot_endpoint = SCREENSHOT_URL_TEMPLATE.format(execution_id)
             
-            response = requests.get(
+            response = get_http_session().get(
                 screenshot_endpoint,
                 timeout=settings.automation.timeout
             )
@@ -205,5 +351,5 @@ class AutomationService:
             return True, response.content
             
         except Exception as e:
-            logger.error(f"Error getting execution screenshot: {e}")
+            logger.error("Error getting execution screenshot: %s", e)
             return False, b""
\ No newline at end of file
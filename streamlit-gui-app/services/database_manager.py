@@ -4,23 +4,152 @@ Database connection and management services
 
 import sys
 import os
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Tuple
 import streamlit as st
 
 # Add knowledge graph path
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'knowledge-graph'))
+KNOWLEDGE_GRAPH_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'knowledge-graph'))
+if KNOWLEDGE_GRAPH_PATH not in sys.path:
+    sys.path.append(KNOWLEDGE_GRAPH_PATH)
+BUSINESS_SCENARIOS_FILE = os.path.join(KNOWLEDGE_GRAPH_PATH, 'src', 'scenarios', 'business_scenarios.py')
+
+# Pool connections opened when the shared knowledge graph is created
+POOL_WARMUP_SESSIONS = 4
 
 from config.settings import settings
 from utils.logging_config import logger, ErrorContext
 from utils.session_manager import SessionManager
 
 try:
+    from neo4j import GraphDatabase
+    from neo4j.exceptions import AuthError, ServiceUnavailable
+except ImportError:
+    # Reported by the knowledge graph import in _load_kg_classes; empty tuples catch nothing
+    GraphDatabase = None
+    AuthError = ServiceUnavailable = ()
+
+@functools.lru_cache(maxsize=1)
+def _load_kg_classes():
+    """
+    Import the knowledge graph classes on first use
+    
+    The import pulls in sentence-transformers and ChromaDB, so it is kept
+    off the first render. A failed import raises and is not cached, so the
+    next connection attempt retries it.
+    
+    Returns:
+        Tuple of (Neo4jKnowledgeGraph, GraphQueryInterface)
+    """
     from src.graph.neo4j_knowledge_graph import Neo4jKnowledgeGraph
     from src.graph.query_interface import GraphQueryInterface
-except ImportError as e:
-    logger.error(f"Failed to import knowledge graph components: {e}")
-    Neo4jKnowledgeGraph = None
-    GraphQueryInterface = None
+    return Neo4jKnowledgeGraph, GraphQueryInterface
+
+@st.cache_resource(show_spinner=False)
+def get_knowledge_graph(
+    uri: str,
+    username: str,
+    password: str,
+    max_connection_pool_size: int = 50,
+    connection_acquisition_timeout: int = 60,
+    max_connection_lifetime: int = 3600,
+    keep_alive: bool = True
+):
+    """
+    Create the Neo4j knowledge graph once per process
+    
+    The Neo4j driver is a thread-safe connection pool, so a single instance
+    is shared by every Streamlit session instead of reconnecting per session.
+    A few pool connections are opened up front so the first sessions don't
+    pay the connection handshake.
+    """
+    logger.info("Connecting to Neo4j at %s", uri)
+    Neo4jKnowledgeGraph, _ = _load_kg_classes()
+    kg = Neo4jKnowledgeGraph(
+        uri=uri,
+        username=username,
+        password=password,
+        driver_config={
+            "max_connection_pool_size": max_connection_pool_size,
+            "connection_acquisition_timeout": connection_acquisition_timeout,
+            "max_connection_lifetime": max_connection_lifetime,
+            "keep_alive": keep_alive
+        }
+    )
+    _warm_up_connection_pool(kg, min(POOL_WARMUP_SESSIONS, max_connection_pool_size))
+    return kg
+
+def _warm_up_connection_pool(kg, session_count: int) -> None:
+    """Open session_count pool connections concurrently (best effort)"""
+    def ping(_):
+        with kg.get_session() as session:
+            session.run("RETURN 1").consume()
+    
+    try:
+        with ThreadPoolExecutor(max_workers=session_count) as executor:
+            list(executor.map(ping, range(session_count)))
+    except Exception as e:
+        logger.warning("Connection pool warmup failed: %s", e)
+
+def get_business_scenarios_version() -> float:
+    """Version key for the scenario definitions (source file modification time)"""
+    try:
+        return os.path.getmtime(BUSINESS_SCENARIOS_FILE)
+    except OSError:
+        return 0.0
+
+@st.cache_data(ttl=settings.app.cache_ttl, show_spinner=False)
+def load_business_scenarios(_kg, _query_interface, scenarios_version: float) -> str:
+    """
+    Ensure business scenarios are loaded into ChromaDB
+    
+    Cached across sessions and keyed on the scenario file version, so only the
+    first session (or the first after an edit) pays for the check and load.
+    Failures raise and are therefore never cached.
+    
+    Returns:
+        Status message
+    """
+    # Check if scenarios already exist (a count, no embedding needed)
+    if _kg.has_business_scenarios():
+        logger.info("Found existing business scenarios in ChromaDB")
+        return "Scenarios already loaded"
+    
+    # Initialize new scenarios
+    logger.info("Loading business scenarios into ChromaDB...")
+    _query_interface.add_sample_business_scenarios()
+    
+    logger.info("Business scenarios loaded successfully")
+    return "Business scenarios loaded into persistent ChromaDB"
+
+# Node, relationship, State and Component counts as one record
+DATABASE_STATS_QUERY = """
+CALL { MATCH (n) RETURN count(n) AS total_nodes }
+CALL { MATCH ()-[r]->() RETURN count(r) AS total_relationships }
+CALL { MATCH (s:State) RETURN count(s) AS states }
+CALL { MATCH (c:Component) RETURN count(c) AS components }
+RETURN total_nodes, total_relationships, states, components
+"""
+
+@st.cache_data(ttl=5, show_spinner=False)
+def query_database_stats(_kg, driver_id: int) -> dict:
+    """
+    Run the database statistics query
+    
+    Cached for a few seconds so rapid reruns reuse the counts. The driver id
+    keys the cache, so a rebuilt driver invalidates it.
+    """
+    with _kg.get_session() as session:
+        # All four counts in one round trip
+        record = session.run(DATABASE_STATS_QUERY).single()
+        
+        return {
+            'total_nodes': record['total_nodes'],
+            'total_relationships': record['total_relationships'],
+            'states': record['states'],
+            'components': record['components']
+        }
 
 class DatabaseManager:
     """Manages database connections and initialization"""
@@ -33,27 +162,29 @@ class DatabaseManager:
         Returns:
             Tuple of (success, error_message)
         """
-        if Neo4jKnowledgeGraph is None or GraphQueryInterface is None:
+        try:
+            _, GraphQueryInterface = _load_kg_classes()
+        except ImportError as e:
+            logger.error("Failed to import knowledge graph components: %s", e)
             return False, "Knowledge graph components not available"
         
         try:
             with ErrorContext("Database connection initialization"):
                 db_config = settings.get_database_config()
-                logger.info(f"Connecting to Neo4j at {db_config['uri']}")
                 
-                # Initialize knowledge graph
-                kg = Neo4jKnowledgeGraph(
-                    uri=db_config['uri'],
-                    username=db_config['username'],
-                    password=db_config['password']
+                # Shared knowledge graph (driver pool, embeddings, ChromaDB)
+                kg = get_knowledge_graph(
+                    db_config['uri'],
+                    db_config['username'],
+                    db_config['password'],
+                    db_config['max_connection_pool_size'],
+                    db_config['connection_acquisition_timeout'],
+                    db_config['max_connection_lifetime'],
+                    db_config['keep_alive']
                 )
                 
                 # Test connection
-                with kg.get_session() as session:
-                    result = session.run("RETURN 1 as test")
-                    test_result = result.single()
-                    if not test_result or test_result['test'] != 1:
-                        raise Exception("Connection test failed")
+                kg.driver.verify_connectivity()
                 
                 # Initialize query interface
                 query_interface = GraphQueryInterface(kg)
@@ -68,6 +199,18 @@ class DatabaseManager:
                 logger.info("Database connection established successfully")
                 return True, "Connected successfully"
                 
+        except ServiceUnavailable as e:
+            error_msg = f"Database connection failed: Neo4j is not reachable ({e})"
+            logger.error(error_msg)
+            SessionManager.set('connection_status', f"error: {str(e)}")
+            return False, error_msg
+        
+        except AuthError as e:
+            error_msg = f"Database connection failed: invalid credentials ({e})"
+            logger.error(error_msg)
+            SessionManager.set('connection_status', f"error: {str(e)}")
+            return False, error_msg
+        
         except Exception as e:
             error_msg = f"Database connection failed: {str(e)}"
             logger.error(error_msg)
@@ -82,32 +225,19 @@ class DatabaseManager:
         Returns:
             Tuple of (success, message)
         """
-        query_interface = SessionManager.get('query_interface')
+        kg, query_interface = SessionManager.get_many('kg', 'query_interface')
         if not query_interface:
             return False, "Query interface not available"
         
         try:
             with ErrorContext("Business scenarios initialization"):
-                # Check if scenarios already exist
-                try:
-                    kg = SessionManager.get('kg')
-                    similar_scenarios = kg.find_similar_business_scenarios("test query", top_k=1)
-                    
-                    if similar_scenarios:
-                        SessionManager.set('scenarios_initialized', True)
-                        logger.info("Found existing business scenarios in ChromaDB")
-                        return True, "Scenarios already loaded"
-                    
-                except Exception:
-                    logger.debug("No existing scenarios found, will initialize new ones")
-                
-                # Initialize new scenarios
-                logger.info("Loading business scenarios into ChromaDB...")
-                query_interface.add_sample_business_scenarios()
+                message = load_business_scenarios(
+                    kg,
+                    query_interface,
+                    get_business_scenarios_version()
+                )
                 SessionManager.set('scenarios_initialized', True)
-                
-                logger.info("Business scenarios loaded successfully")
-                return True, "Business scenarios loaded into persistent ChromaDB"
+                return True, message
                 
         except Exception as e:
             error_msg = f"Failed to initialize scenarios: {str(e)}"
@@ -130,9 +260,9 @@ class DatabaseManager:
             # Also reinitialize scenarios
             scenario_success, scenario_message = DatabaseManager.initialize_business_scenarios()
             if not scenario_success:
-                logger.warning(f"Scenarios not initialized: {scenario_message}")
+                logger.warning("Scenarios not initialized: %s", scenario_message)
         
-        logger.info(f"Connection refresh completed: {message}")
+        logger.info("Connection refresh completed: %s", message)
     
     @staticmethod
     def test_connection(uri: str, username: str, password: str) -> Tuple[bool, str]:
@@ -147,20 +277,29 @@ class DatabaseManager:
         Returns:
             Tuple of (success, message)
         """
-        if Neo4jKnowledgeGraph is None:
+        if GraphDatabase is None:
             return False, "Knowledge graph components not available"
         
         try:
             with ErrorContext("Database connection test", show_in_ui=False):
-                test_kg = Neo4jKnowledgeGraph(uri, username, password)
-                
-                with test_kg.get_session() as session:
-                    session.run("RETURN 1")
+                # A bare driver is enough to check the credentials; the full
+                # knowledge graph would also load the embedding model and ChromaDB
+                with GraphDatabase.driver(uri, auth=(username, password)) as driver:
+                    driver.verify_connectivity()
                 
-                test_kg.close()
-                logger.info(f"Connection test successful for {uri}")
+                logger.info("Connection test successful for %s", uri)
                 return True, "Connection successful!"
                 
+        except ServiceUnavailable as e:
+            error_msg = f"Connection test failed: Neo4j is not reachable ({e})"
+            logger.error(error_msg)
+            return False, error_msg
+        
+        except AuthError as e:
+            error_msg = f"Connection test failed: invalid credentials ({e})"
+            logger.error(error_msg)
+            return False, error_msg
+        
         except Exception as e:
             error_msg = f"Connection test failed: {str(e)}"
             logger.error(error_msg)
@@ -174,43 +313,20 @@ class DatabaseManager:
             return {}
         
         try:
-            with kg.get_session() as session:
-                # Get node counts
-                result = session.run("MATCH (n) RETURN count(n) as total_nodes")
-                total_nodes = result.single()['total_nodes']
-                
-                # Get relationship counts
-                result = session.run("MATCH ()-[r]->() RETURN count(r) as total_relationships")
-                total_relationships = result.single()['total_relationships']
-                
-                # Get states count
-                result = session.run("MATCH (s:State) RETURN count(s) as states")
-                states = result.single()['states']
-                
-                # Get components count
-                result = session.run("MATCH (c:Component) RETURN count(c) as components")
-                components = result.single()['components']
-                
-                return {
-                    'total_nodes': total_nodes,
-                    'total_relationships': total_relationships,
-                    'states': states,
-                    'components': components
-                }
-                
+            return query_database_stats(kg, id(kg.driver))
         except Exception as e:
-            logger.error(f"Failed to get database stats: {e}")
+            logger.error("Failed to get database stats: %s", e)
             return {}
     
     @staticmethod
     def close_connection() -> None:
-        """Close the database connection"""
-        kg = SessionManager.get('kg')
-        if kg:
-            try:
-                kg.close()
-                logger.info("Database connection closed")
-            except Exception as e:
-                logger.error(f"Error closing database connection: {e}")
+        """
+        Release this session's database connection
+        
+        The underlying driver is shared through get_knowledge_graph and lives
+        for the whole process, so it is not closed here.
+        """
+        if SessionManager.get('kg'):
+            logger.info("Database connection released")
         
         SessionManager.reset_connection_state()
\ No newline at end of file
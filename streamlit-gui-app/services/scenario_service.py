@@ -4,23 +4,315 @@ Business logic for scenario management and processing
 
 import sys
 import os
-from typing import List, Dict, Any, Optional, Tuple
+import csv
+import functools
+import hashlib
+import io
+import pickle
+from pathlib import Path
+from typing import List, Dict, Any, Iterable, Optional, Set, Tuple
 import json
+import numpy as np
+import streamlit as st
 
-# Add paths
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'knowledge-graph'))
+KNOWLEDGE_GRAPH_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'knowledge-graph'))
 
 from config.settings import settings
 from utils.logging_config import logger, ErrorContext
 from utils.session_manager import SessionManager
 
+@functools.lru_cache(maxsize=1)
+def _load_scenario_components() -> Optional[Tuple[Any, Any, Any]]:
+    """
+    Import the knowledge graph scenario components on first use
+    
+    Keeps the path setup and the scenario/pydantic model imports off module
+    import. The outcome, including a failed import, is cached for the process.
+    
+    Returns:
+        Tuple of (get_all_business_scenarios, BusinessScenario, ScenarioType),
+        or None if the components are not available
+    """
+    if KNOWLEDGE_GRAPH_PATH not in sys.path:
+        sys.path.append(KNOWLEDGE_GRAPH_PATH)
+    
+    try:
+        from src.scenarios.business_scenarios import get_all_business_scenarios
+        from src.models.scenario import BusinessScenario, ScenarioType
+    except ImportError as e:
+        logger.error("Failed to import scenario components: %s", e)
+        return None
+    
+    return get_all_business_scenarios, BusinessScenario, ScenarioType
+
 try:
-    from src.scenarios.business_scenarios import get_all_business_scenarios
-    from src.models.scenario import ScenarioType
-except ImportError as e:
-    logger.error(f"Failed to import scenario components: {e}")
-    get_all_business_scenarios = None
-    ScenarioType = None
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Scenario import settings
+IMPORT_BATCH_SIZE = 5000
+SCENARIO_NODE_FIELDS = {
+    'id', 'title', 'feature', 'goal', 'scenario_type',
+    'given_conditions', 'when_actions', 'then_expectations', 'tags'
+}
+SCENARIO_CONSTRAINT_QUERY = (
+    "CREATE CONSTRAINT scenario_id_unique IF NOT EXISTS "
+    "FOR (s:Scenario) REQUIRE s.id IS UNIQUE"
+)
+SCENARIO_IMPORT_QUERY = """
+    UNWIND $rows AS row
+    MERGE (s:Scenario {id: row.id})
+    SET s += row
+"""
+
+# Header of the CSV scenario summary export
+EXPORT_CSV_COLUMNS = ('ID', 'Title', 'Feature', 'Goal', 'Type', 'Tags', 'Steps Count')
+
+@functools.lru_cache(maxsize=1)
+def _load_scenarios() -> List[Any]:
+    """Load business scenarios once and precompute their display strings"""
+    get_all_business_scenarios, _, _ = _load_scenario_components()
+    scenarios = get_all_business_scenarios()
+    
+    # Scenarios are immutable reference data, so join list fields once here
+    # instead of on every card render
+    for s in scenarios:
+        s._given_str = ', '.join(s.given_conditions)
+        s._when_str = ', '.join(s.when_actions)
+        s._then_str = ', '.join(s.then_expectations)
+        s._tags_str = ', '.join(s.tags)
+    
+    return scenarios
+
+# On-disk copy of the index postings, reused while the scenarios are unchanged;
+# bump the format when the postings layout changes
+SCENARIO_INDEX_CACHE_FILE = Path(settings.app.scenario_index_cache).expanduser()
+SCENARIO_INDEX_CACHE_FORMAT = 2
+
+# Shared empty posting for filter values no scenario has
+_NO_MATCHES: np.ndarray = np.empty(0, dtype=np.int32)
+
+def _trigrams(text: str) -> Set[str]:
+    """All three-character substrings of text"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+class _ScenarioIndex:
+    """
+    Inverted indexes over the loaded scenarios
+    
+    Feature, type and tag filters map to the positions of the scenarios
+    that have them. For text search, each scenario's title, feature and goal
+    are lowercased once into a search blob, and every trigram of a blob maps
+    to the positions of the scenarios containing it; a substring query can
+    only match scenarios holding all of its trigrams. Postings are sorted
+    int32 arrays. A search is the intersection of the postings of every
+    active filter, followed by the exact substring check on what is left.
+    """
+    
+    def __init__(self, scenarios: List[Any], postings: Optional[Dict[str, Dict[str, np.ndarray]]] = None):
+        self.scenarios = scenarios
+        # Fields are newline-joined so a single-line query never matches
+        # across two of them
+        self.search_blobs = [
+            f"{s.title}\n{s.feature}\n{s.goal}".lower() for s in scenarios
+        ]
+        
+        # Postings restored from the on-disk cache skip the build
+        if postings is None:
+            postings = self._build_postings()
+        self.feature_postings: Dict[str, np.ndarray] = postings['feature']
+        self.type_postings: Dict[str, np.ndarray] = postings['type']
+        self.tag_postings: Dict[str, np.ndarray] = postings['tag']
+        self.trigram_postings: Dict[str, np.ndarray] = postings['trigram']
+        
+        self.features = sorted(self.feature_postings)
+        self.types = sorted(self.type_postings)
+        self.tags = sorted(self.tag_postings)
+        
+        # Sorted once here and handed out as is; callers only read it
+        _, _, ScenarioType = _load_scenario_components()
+        self.filter_options: Dict[str, List[str]] = {
+            "features": self.features,
+            # List every known type, not only those in use
+            "types": [t.value for t in ScenarioType],
+            "tags": self.tags
+        }
+    
+    def _build_postings(self) -> Dict[str, Dict[str, np.ndarray]]:
+        """Build the feature, type, tag and trigram postings of the scenarios"""
+        postings: Dict[str, Dict[str, Set[int]]] = {
+            'feature': {}, 'type': {}, 'tag': {}, 'trigram': {}
+        }
+        for i, s in enumerate(self.scenarios):
+            postings['feature'].setdefault(s.feature, set()).add(i)
+            postings['type'].setdefault(s.scenario_type, set()).add(i)
+            for tag in s.tags:
+                postings['tag'].setdefault(tag, set()).add(i)
+            for trigram in _trigrams(self.search_blobs[i]):
+                postings['trigram'].setdefault(trigram, set()).add(i)
+        
+        # Contiguous arrays take 4 bytes per position instead of a set entry
+        return {
+            kind: {
+                key: np.fromiter(sorted(ids), dtype=np.int32, count=len(ids))
+                for key, ids in kind_postings.items()
+            }
+            for kind, kind_postings in postings.items()
+        }
+    
+    @property
+    def postings(self) -> Dict[str, Dict[str, np.ndarray]]:
+        """All postings, in the form accepted by the constructor"""
+        return {
+            'feature': self.feature_postings,
+            'type': self.type_postings,
+            'tag': self.tag_postings,
+            'trigram': self.trigram_postings
+        }
+    
+    def candidates(
+        self,
+        feature_filter: str,
+        type_filter: str,
+        tag_filter: str,
+        search_terms: Tuple[str, ...]
+    ) -> Iterable[int]:
+        """Positions passing every filter, in order; text matches still need the substring check"""
+        postings = []
+        if feature_filter != "All":
+            postings.append(self.feature_postings.get(feature_filter, _NO_MATCHES))
+        if type_filter != "All":
+            postings.append(self.type_postings.get(type_filter, _NO_MATCHES))
+        if tag_filter != "All":
+            postings.append(self.tag_postings.get(tag_filter, _NO_MATCHES))
+        # Every term is a substring of a match, so all of their trigrams must be present
+        trigrams = set().union(*(_trigrams(term) for term in search_terms))
+        postings.extend(self.trigram_postings.get(t, _NO_MATCHES) for t in trigrams)
+        
+        if not postings:
+            return range(len(self.scenarios))
+        
+        # Intersect from the smallest posting so the working set stays small;
+        # positions are unique within a posting, which skips a dedup pass
+        postings.sort(key=len)
+        matches = functools.reduce(
+            lambda a, b: np.intersect1d(a, b, assume_unique=True), postings
+        )
+        return matches.tolist()
+
+# Index for the current _load_scenarios() result, rebuilt if that changes
+_scenario_index: Optional[_ScenarioIndex] = None
+
+def _get_scenario_index() -> _ScenarioIndex:
+    """Get the search index for the loaded scenarios, building it on first use"""
+    global _scenario_index
+    
+    scenarios = _load_scenarios()
+    index = _scenario_index
+    if index is None or index.scenarios is not scenarios:
+        fingerprint = _scenarios_fingerprint(scenarios)
+        postings = _read_cached_postings(fingerprint)
+        index = _ScenarioIndex(scenarios, postings)
+        if postings is None:
+            _write_cached_postings(fingerprint, index.postings)
+        _scenario_index = index
+    return index
+
+def _scenarios_fingerprint(scenarios: List[Any]) -> str:
+    """Digest of the indexed scenario fields, stable across processes"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{SCENARIO_INDEX_CACHE_FORMAT}:{len(scenarios)}".encode())
+    for s in scenarios:
+        digest.update(repr((s.id, s.title, s.feature, s.goal, s.scenario_type, s.tags)).encode())
+    return digest.hexdigest()
+
+def _read_cached_postings(fingerprint: str) -> Optional[Dict[str, Dict[str, np.ndarray]]]:
+    """Postings from the on-disk index cache, or None if missing, unreadable or stale"""
+    try:
+        with open(SCENARIO_INDEX_CACHE_FILE, 'rb') as f:
+            cached = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning("Ignoring unreadable scenario index cache: %s", e)
+        return None
+    
+    if not isinstance(cached, dict) or cached.get('fingerprint') != fingerprint:
+        return None
+    logger.debug("Loaded scenario index from %s", SCENARIO_INDEX_CACHE_FILE)
+    return cached['postings']
+
+def _write_cached_postings(fingerprint: str, postings: Dict[str, Dict[str, np.ndarray]]) -> None:
+    """Save postings to the on-disk index cache (best effort)"""
+    tmp_path = SCENARIO_INDEX_CACHE_FILE.with_suffix('.tmp')
+    try:
+        SCENARIO_INDEX_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(
+                {'fingerprint': fingerprint, 'postings': postings},
+                f,
+                protocol=pickle.HIGHEST_PROTOCOL
+            )
+        # Swapped in whole so a concurrent reader never sees a partial file
+        os.replace(tmp_path, SCENARIO_INDEX_CACHE_FILE)
+    except OSError as e:
+        logger.warning("Could not write scenario index cache: %s", e)
+
+@functools.lru_cache(maxsize=32)
+def _search_terms_automaton(search_terms: Tuple[str, ...]):
+    """Aho-Corasick automaton reporting the index of each search term it finds"""
+    automaton = ahocorasick.Automaton()
+    for i, term in enumerate(search_terms):
+        automaton.add_word(term, i)
+    automaton.make_automaton()
+    return automaton
+
+def _contains_all_terms(automaton, blob: str, term_count: int) -> bool:
+    """Check in one scan of blob that every term of the automaton occurs in it"""
+    found = set()
+    for _, term_index in automaton.iter(blob):
+        found.add(term_index)
+        if len(found) == term_count:
+            return True
+    return False
+
+@st.cache_data(ttl=settings.app.cache_ttl, max_entries=64, show_spinner=False)
+def _filter_scenario_ids(
+    feature_filter: str,
+    type_filter: str,
+    tag_filter: str,
+    search_lower: str
+) -> List[int]:
+    """
+    Return positions of matching scenarios, memoized per filter combination
+    
+    Positions index into _load_scenarios() so the cache stores plain ints
+    rather than pickled scenario models.
+    """
+    index = _get_scenario_index()
+    search_blobs = index.search_blobs
+    
+    # Whitespace-separated terms must all appear, in any order
+    search_terms = tuple(dict.fromkeys(search_lower.split()))
+    candidates = index.candidates(feature_filter, type_filter, tag_filter, search_terms)
+    
+    if not search_terms:
+        return list(candidates)
+    if len(search_terms) == 1:
+        term = search_terms[0]
+        return [i for i in candidates if term in search_blobs[i]]
+    if ahocorasick is None:
+        return [i for i in candidates if all(term in search_blobs[i] for term in search_terms)]
+    
+    automaton = _search_terms_automaton(search_terms)
+    term_count = len(search_terms)
+    return [i for i in candidates if _contains_all_terms(automaton, search_blobs[i], term_count)]
 
 class ScenarioService:
     """Service for managing business scenarios and test generation"""
@@ -69,24 +361,16 @@ class ScenarioService:
     @staticmethod
     def get_scenario_statistics() -> Dict[str, int]:
         """Get statistics about available scenarios"""
-        if get_all_business_scenarios is None:
+        if _load_scenario_components() is None:
             return {}
         
         try:
-            scenarios = get_all_business_scenarios()
-            
-            # Count features
-            features = set(s.feature for s in scenarios)
-            
-            # Count tags
-            all_tags = set()
-            for s in scenarios:
-                all_tags.update(s.tags)
+            index = _get_scenario_index()
             
             return {
-                'total_scenarios': len(scenarios),
-                'features_covered': len(features),
-                'unique_tags': len(all_tags)
+                'total_scenarios': len(index.scenarios),
+                'features_covered': len(index.features),
+                'unique_tags': len(index.tags)
             }
             
         except Exception as e:
@@ -112,73 +396,46 @@ class ScenarioService:
         Returns:
             List of filtered scenarios
         """
-        if get_all_business_scenarios is None:
+        if _load_scenario_components() is None:
             logger.warning("Business scenarios not available")
             return []
         
         try:
             with ErrorContext("Scenario search", show_in_ui=False):
-                all_scenarios = get_all_business_scenarios()
-                filtered_scenarios = all_scenarios
-                
-                # Apply feature filter
-                if feature_filter != "All":
-                    filtered_scenarios = [s for s in filtered_scenarios if s.feature == feature_filter]
-                
-                # Apply type filter
-                if type_filter != "All":
-                    filtered_scenarios = [s for s in filtered_scenarios if s.scenario_type == type_filter]
+                all_scenarios = _load_scenarios()
+                filtered_ids = _filter_scenario_ids(
+                    feature_filter, type_filter, tag_filter, search_query.lower()
+                )
+                filtered_scenarios = [all_scenarios[i] for i in filtered_ids]
                 
-                # Apply tag filter
-                if tag_filter != "All":
-                    filtered_scenarios = [s for s in filtered_scenarios if tag_filter in s.tags]
-                
-                # Apply text search
-                if search_query:
-                    search_lower = search_query.lower()
-                    filtered_scenarios = [
-                        s for s in filtered_scenarios if 
-                        search_lower in s.title.lower() or 
-                        search_lower in s.feature.lower() or
-                        search_lower in s.goal.lower()
-                    ]
-                
-                logger.debug(f"Filtered scenarios: {len(filtered_scenarios)} from {len(all_scenarios)} total")
+                logger.debug("Filtered scenarios: %s from %s total", len(filtered_scenarios), len(all_scenarios))
                 return filtered_scenarios
                 
         except Exception as e:
             logger.error(f"Error searching scenarios: {e}")
             return []
     
+    @staticmethod
+    def invalidate() -> None:
+        """Drop the loaded scenarios and everything derived from them"""
+        global _scenario_index
+        # utils.caching imports this module, so it is imported here
+        from utils.caching import get_scenarios_with_cache
+        
+        _load_scenarios.cache_clear()
+        _scenario_index = None
+        _filter_scenario_ids.clear()
+        get_scenarios_with_cache.cache_clear()
+        logger.info("Cleared scenario cache and search indexes")
+    
     @staticmethod
     def get_filter_options() -> Dict[str, List[str]]:
         """Get available filter options for scenarios"""
-        if get_all_business_scenarios is None:
+        if _load_scenario_components() is None:
             return {"features": [], "types": [], "tags": []}
         
         try:
-            scenarios = get_all_business_scenarios()
-            
-            # Get unique features
-            features = sorted(list(set(s.feature for s in scenarios)))
-            
-            # Get scenario types
-            if ScenarioType:
-                types = [t.value for t in ScenarioType]
-            else:
-                types = sorted(list(set(s.scenario_type for s in scenarios)))
-            
-            # Get unique tags
-            all_tags = set()
-            for s in scenarios:
-                all_tags.update(s.tags)
-            tags = sorted(list(all_tags))
-            
-            return {
-                "features": features,
-                "types": types,
-                "tags": tags
-            }
+            return _get_scenario_index().filter_options
             
         except Exception as e:
             logger.error(f"Error getting filter options: {e}")
@@ -212,6 +469,71 @@ class ScenarioService:
             logger.error(error_msg)
             return False, error_msg
     
+    @staticmethod
+    def import_scenarios(scenarios_data: Iterable[Dict[str, Any]]) -> Tuple[bool, str]:
+        """
+        Import scenarios into Neo4j as batched UNWIND writes
+        
+        Rows are validated as they are read, so a streaming iterator is
+        never held in memory beyond one batch.
+        
+        Args:
+            scenarios_data: Iterable of scenario dictionaries
+            
+        Returns:
+            Tuple of (success, message)
+        """
+        components = _load_scenario_components()
+        if components is None:
+            return False, "Business scenarios not available"
+        _, BusinessScenario, _ = components
+        
+        kg = SessionManager.get('kg')
+        if not kg:
+            return False, "No database connection available"
+        
+        def write_batch(session, batch: List[Dict[str, Any]]) -> None:
+            # One transaction per batch keeps transaction memory bounded
+            session.execute_write(
+                lambda tx: tx.run(SCENARIO_IMPORT_QUERY, rows=batch).consume()
+            )
+        
+        try:
+            with ErrorContext("Scenario import", show_in_ui=False):
+                imported = 0
+                batch = []
+                
+                with kg.get_session() as session:
+                    session.run(SCENARIO_CONSTRAINT_QUERY)
+                    
+                    for scenario_data in scenarios_data:
+                        scenario = BusinessScenario(**scenario_data)
+                        if scenario.id is None:
+                            return False, (
+                                f"Scenario at position {imported + len(batch)} is missing an id "
+                                f"({imported} scenarios imported before it)"
+                            )
+                        batch.append(scenario.model_dump(include=SCENARIO_NODE_FIELDS))
+                        
+                        if len(batch) >= IMPORT_BATCH_SIZE:
+                            write_batch(session, batch)
+                            imported += len(batch)
+                            batch = []
+                    
+                    if batch:
+                        write_batch(session, batch)
+                        imported += len(batch)
+                
+                message = f"Imported {imported} scenarios"
+                logger.info(message)
+                ScenarioService.invalidate()
+                return True, message
+                
+        except Exception as e:
+            error_msg = f"Error importing scenarios: {str(e)}"
+            logger.error(error_msg)
+            return False, error_msg
+    
     @staticmethod
     def export_scenarios(format_type: str = "json") -> Tuple[bool, Any, str]:
         """
@@ -223,35 +545,35 @@ class ScenarioService:
         Returns:
             Tuple of (success, data, message)
         """
-        if get_all_business_scenarios is None:
+        if _load_scenario_components() is None:
             return False, None, "Business scenarios not available"
         
         try:
             with ErrorContext("Scenario export", show_in_ui=False):
-                scenarios = get_all_business_scenarios()
+                scenarios = _load_scenarios()
                 
                 if format_type.lower() == "json":
-                    data = [s.model_dump() for s in scenarios]
-                    json_data = json.dumps(data, indent=2)
+                    if orjson is not None:
+                        # orjson calls model_dump for each scenario as it serializes
+                        json_data = orjson.dumps(
+                            scenarios, default=lambda s: s.model_dump(), option=orjson.OPT_INDENT_2
+                        ).decode("utf-8")
+                    else:
+                        json_data = json.dumps([s.model_dump() for s in scenarios], indent=2)
                     return True, json_data, f"Exported {len(scenarios)} scenarios as JSON"
                 
                 elif format_type.lower() == "csv":
-                    import pandas as pd
-                    
-                    summary_data = []
-                    for s in scenarios:
-                        summary_data.append({
-                            'ID': s.id,
-                            'Title': s.title,
-                            'Feature': s.feature,
-                            'Goal': s.goal,
-                            'Type': s.scenario_type,
-                            'Tags': ', '.join(s.tags),
-                            'Steps Count': len(s.given_conditions) + len(s.when_actions) + len(s.then_expectations)
-                        })
-                    
-                    df = pd.DataFrame(summary_data)
-                    csv_data = df.to_csv(index=False)
+                    buffer = io.StringIO()
+                    writer = csv.writer(buffer, lineterminator='\n')
+                    writer.writerow(EXPORT_CSV_COLUMNS)
+                    writer.writerows(
+                        (
+                            s.id, s.title, s.feature, s.goal, s.scenario_type, ', '.join(s.tags),
+                            len(s.given_conditions) + len(s.when_actions) + len(s.then_expectations)
+                        )
+                        for s in scenarios
+                    )
+                    csv_data = buffer.getvalue()
                     return True, csv_data, f"Exported {len(scenarios)} scenarios as CSV"
                 
                 else:
@@ -269,18 +591,20 @@ class ScenarioService:
             return "No plan available"
         
         try:
-            text = f"Test Plan: {plan.scenario_title}\n"
-            text += "=" * 50 + "\n\n"
+            # Collect the pieces and join once; repeated += copies the text so far
+            parts = [f"Test Plan: {plan.scenario_title}\n", "=" * 50 + "\n\n"]
+            append = parts.append
             
             for step in plan.steps:
-                text += f"Step {step.step_id}: {step.description}\n"
-                text += f"  Action: {step.action_type.upper()}\n"
-                text += f"  Query: {step.query_for_qwen}\n"
-                if step.expected_state:
-                    text += f"  Expected Result: {step.expected_state}\n"
-                text += "\n"
+                expected_state = step.expected_state
+                append(f"Step {step.step_id}: {step.description}\n")
+                append(f"  Action: {step.action_type.upper()}\n")
+                append(f"  Query: {step.query_for_qwen}\n")
+                if expected_state:
+                    append(f"  Expected Result: {expected_state}\n")
+                append("\n")
             
-            return text
+            return "".join(parts)
             
         except Exception as e:
             logger.error(f"Error formatting plan as text: {e}")
@@ -4,12 +4,29 @@ Caching utilities for performance optimization
 
 import streamlit as st
 from functools import wraps
-from typing import Any, Callable, Optional
+from typing import Any, Callable, Dict, Optional, Tuple
+from collections import OrderedDict, deque
 import hashlib
-import json
+import pickle
+import threading
 import time
 from utils.logging_config import logger
 from config.settings import settings
+from services.scenario_service import ScenarioService
+from services.database_manager import DatabaseManager
+from utils.session_manager import SessionManager
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+NS_PER_SECOND = 1_000_000_000
+
+# Process-wide LRU cache shared by all sessions: key -> (monotonic_ns expiry, value),
+# least recently used first and capped at settings.app.cache_max_entries
+_cache: "OrderedDict[str, Tuple[int, Any]]" = OrderedDict()
+_cache_lock = threading.Lock()
 
 class CacheManager:
     """Manages application caching with TTL support"""
@@ -17,20 +34,18 @@ class CacheManager:
     @staticmethod
     def generate_cache_key(*args, **kwargs) -> str:
         """Generate a cache key from function arguments"""
+        # Sorting kwargs makes the key independent of keyword order
+        key_data = (args, tuple(sorted(kwargs.items())))
         try:
-            # Create a string representation of all arguments
-            key_data = {
-                'args': args,
-                'kwargs': kwargs
-            }
-            key_string = json.dumps(key_data, sort_keys=True, default=str)
-            
-            # Create hash of the key string
-            return hashlib.md5(key_string.encode()).hexdigest()
+            key_bytes = pickle.dumps(key_data, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            # Unpicklable arguments (locks, drivers, ...) are keyed by repr
+            key_bytes = repr(key_data).encode()
         
-        except Exception as e:
-            logger.warning(f"Error generating cache key: {e}")
-            return f"fallback_key_{int(time.time())}"
+        # Non-cryptographic hash; xxhash when installed, else blake2b
+        if xxhash is not None:
+            return xxhash.xxh3_64_hexdigest(key_bytes)
+        return hashlib.blake2b(key_bytes, digest_size=16).hexdigest()
     
     @staticmethod
     def get_cached_value(key: str) -> tuple[bool, Any]:
@@ -43,77 +58,65 @@ class CacheManager:
         Returns:
             Tuple of (found, value)
         """
-        try:
-            cache_key = f"cache_{key}"
-            timestamp_key = f"cache_timestamp_{key}"
-            
-            if cache_key in st.session_state and timestamp_key in st.session_state:
-                # Check if cache is still valid
-                cached_time = st.session_state[timestamp_key]
-                current_time = time.time()
-                
-                if (current_time - cached_time) < settings.app.cache_ttl:
-                    logger.debug(f"Cache hit for key: {key}")
-                    return True, st.session_state[cache_key]
-                else:
-                    # Cache expired, remove it
-                    logger.debug(f"Cache expired for key: {key}")
-                    CacheManager.clear_cache_key(key)
+        with _cache_lock:
+            entry = _cache.get(key)
+            if entry is None:
+                return False, None
             
+            expires_at, value = entry
+            if time.monotonic_ns() >= expires_at:
+                # Cache expired, remove it
+                del _cache[key]
+                entry = None
+            else:
+                _cache.move_to_end(key)
+        
+        if entry is None:
+            logger.debug("Cache expired for key: %s", key)
             return False, None
-            
-        except Exception as e:
-            logger.warning(f"Error getting cached value: {e}")
-            return False, None
+        
+        logger.debug("Cache hit for key: %s", key)
+        return True, value
     
     @staticmethod
-    def set_cached_value(key: str, value: Any) -> None:
-        """Set a cached value with timestamp"""
-        try:
-            cache_key = f"cache_{key}"
-            timestamp_key = f"cache_timestamp_{key}"
-            
-            st.session_state[cache_key] = value
-            st.session_state[timestamp_key] = time.time()
-            
-            logger.debug(f"Cached value for key: {key}")
-            
-        except Exception as e:
-            logger.warning(f"Error setting cached value: {e}")
+    def set_cached_value(key: str, value: Any, ttl: Optional[int] = None) -> None:
+        """Set a cached value that expires after ttl seconds (app default if not given)"""
+        ttl_ns = (settings.app.cache_ttl if ttl is None else ttl) * NS_PER_SECOND
+        expires_at = time.monotonic_ns() + ttl_ns
+        with _cache_lock:
+            _cache[key] = (expires_at, value)
+            _cache.move_to_end(key)
+            if len(_cache) > settings.app.cache_max_entries:
+                _cache.popitem(last=False)
+        
+        logger.debug("Cached value for key: %s", key)
     
     @staticmethod
     def clear_cache_key(key: str) -> None:
         """Clear a specific cache key"""
-        try:
-            cache_key = f"cache_{key}"
-            timestamp_key = f"cache_timestamp_{key}"
-            
-            if cache_key in st.session_state:
-                del st.session_state[cache_key]
-            if timestamp_key in st.session_state:
-                del st.session_state[timestamp_key]
-                
-            logger.debug(f"Cleared cache for key: {key}")
-            
-        except Exception as e:
-            logger.warning(f"Error clearing cache key: {e}")
+        with _cache_lock:
+            _cache.pop(key, None)
+        
+        logger.debug("Cleared cache for key: %s", key)
+    
+    @staticmethod
+    def clear_cache_prefix(prefix: str) -> None:
+        """Clear every cache key starting with prefix"""
+        with _cache_lock:
+            keys = [key for key in _cache if key.startswith(prefix)]
+            for key in keys:
+                del _cache[key]
+        
+        logger.debug("Cleared %d cache entries with prefix: %s", len(keys), prefix)
     
     @staticmethod
     def clear_all_cache() -> None:
         """Clear all cached values"""
-        try:
-            keys_to_remove = [
-                key for key in st.session_state.keys() 
-                if key.startswith('cache_')
-            ]
-            
-            for key in keys_to_remove:
-                del st.session_state[key]
-            
-            logger.info(f"Cleared {len(keys_to_remove)} cache entries")
-            
-        except Exception as e:
-            logger.warning(f"Error clearing all cache: {e}")
+        with _cache_lock:
+            count = len(_cache)
+            _cache.clear()
+        
+        logger.info("Cleared %d cache entries", count)
 
 def cached_function(ttl: Optional[int] = None):
     """
@@ -122,6 +125,9 @@ def cached_function(ttl: Optional[int] = None):
     Args:
         ttl: Time to live in seconds (uses app default if not specified)
     """
+    # Resolve the app default once, not on every call
+    ttl_seconds = settings.app.cache_ttl if ttl is None else ttl
+    
     def decorator(func: Callable) -> Callable:
         @wraps(func)
         def wrapper(*args, **kwargs):
@@ -136,15 +142,17 @@ def cached_function(ttl: Optional[int] = None):
             
             # Execute function and cache result
             try:
-                logger.debug(f"Executing and caching: {func.__name__}")
+                logger.debug("Executing and caching: %s", func.__name__)
                 result = func(*args, **kwargs)
-                CacheManager.set_cached_value(cache_key, result)
+                CacheManager.set_cached_value(cache_key, result, ttl_seconds)
                 return result
                 
             except Exception as e:
-                logger.error(f"Error in cached function {func.__name__}: {e}")
+                logger.error("Error in cached function %s: %s", func.__name__, e)
                 raise
         
+        # Drops the results for every argument combination
+        wrapper.cache_clear = lambda: CacheManager.clear_cache_prefix(f"{func.__name__}_")
         return wrapper
     return decorator
 
@@ -164,55 +172,101 @@ def cached_resource_function(func: Callable) -> Callable:
 def get_scenarios_with_cache():
     """Cached version of get_all_business_scenarios"""
     try:
-        from services.scenario_service import ScenarioService
         return ScenarioService.get_filter_options()
     except Exception as e:
-        logger.error(f"Error getting cached scenarios: {e}")
+        logger.error("Error getting cached scenarios: %s", e)
         return {"features": [], "types": [], "tags": []}
 
-@cached_function(ttl=60)  # 1 minute
 def get_database_stats_cached():
-    """Cached version of database statistics"""
+    """
+    Cached version of database statistics
+    
+    The cache is shared by all sessions, so results are keyed on the
+    session's database driver, and disconnected sessions bypass it.
+    """
+    kg = SessionManager.get('kg')
+    if not kg:
+        return {}
+    return _get_database_stats_for_driver(id(kg.driver))
+
+@cached_function(ttl=60)  # 1 minute
+def _get_database_stats_for_driver(driver_id: int):
+    """Database statistics of the current session, cached per driver"""
     try:
-        from services.database_manager import DatabaseManager
         return DatabaseManager.get_database_stats()
     except Exception as e:
-        logger.error(f"Error getting cached database stats: {e}")
+        logger.error("Error getting cached database stats: %s", e)
         return {}
 
+# Calls slower than this are logged
+SLOW_FUNCTION_NS = NS_PER_SECOND
+
+# Recent (name, nanoseconds, succeeded) timings shared by all sessions
+_timings = deque(maxlen=1024)
+_timings_lock = threading.Lock()
+
 class PerformanceMonitor:
     """Monitor and log performance metrics"""
     
     @staticmethod
     def time_function(func_name: str = None):
-        """Decorator to time function execution"""
+        """
+        Decorator to time function execution
+        
+        Timings are recorded in memory (see dump) instead of logged per call;
+        only slow or failing calls are logged.
+        """
         def decorator(func: Callable) -> Callable:
+            name = func_name or func.__name__
+            
             @wraps(func)
             def wrapper(*args, **kwargs):
-                start_time = time.time()
-                name = func_name or func.__name__
+                start_ns = time.perf_counter_ns()
                 
                 try:
                     result = func(*args, **kwargs)
-                    end_time = time.time()
-                    execution_time = end_time - start_time
-                    
-                    if execution_time > 1.0:  # Log slow functions
-                        logger.warning(f"Slow function '{name}': {execution_time:.2f}s")
-                    else:
-                        logger.debug(f"Function '{name}': {execution_time:.2f}s")
-                    
-                    return result
-                    
                 except Exception as e:
-                    end_time = time.time()
-                    execution_time = end_time - start_time
-                    logger.error(f"Function '{name}' failed after {execution_time:.2f}s: {e}")
+                    elapsed_ns = time.perf_counter_ns() - start_ns
+                    with _timings_lock:
+                        _timings.append((name, elapsed_ns, False))
+                    logger.error("Function '%s' failed after %.2fs: %s", name, elapsed_ns / NS_PER_SECOND, e)
                     raise
+                
+                elapsed_ns = time.perf_counter_ns() - start_ns
+                with _timings_lock:
+                    _timings.append((name, elapsed_ns, True))
+                
+                if elapsed_ns > SLOW_FUNCTION_NS:  # Log slow functions
+                    logger.warning("Slow function '%s': %.2fs", name, elapsed_ns / NS_PER_SECOND)
+                
+                return result
             
             return wrapper
         return decorator
     
+    @staticmethod
+    def dump() -> Dict[str, Dict[str, Any]]:
+        """Summarize the recorded timings per function name"""
+        with _timings_lock:
+            timings = list(_timings)
+        
+        summary = {}
+        for name, elapsed_ns, succeeded in timings:
+            stats = summary.setdefault(name, {'calls': 0, 'failures': 0, 'total_s': 0, 'max_s': 0})
+            stats['calls'] += 1
+            stats['total_s'] += elapsed_ns
+            stats['max_s'] = max(stats['max_s'], elapsed_ns)
+            if not succeeded:
+                stats['failures'] += 1
+        
+        # Totals are accumulated in integer nanoseconds and converted once
+        for stats in summary.values():
+            stats['mean_s'] = round(stats['total_s'] / stats['calls'] / NS_PER_SECOND, 4)
+            stats['total_s'] = round(stats['total_s'] / NS_PER_SECOND, 4)
+            stats['max_s'] = round(stats['max_s'] / NS_PER_SECOND, 4)
+        
+        return summary
+    
     @staticmethod
     def log_memory_usage():
         """Log current memory usage (if psutil is available)"""
@@ -225,14 +279,14 @@ class PerformanceMonitor:
             memory_mb = memory_info.rss / 1024 / 1024
             
             if memory_mb > 500:  # Log high memory usage
-                logger.warning(f"High memory usage: {memory_mb:.1f} MB")
+                logger.warning("High memory usage: %.1f MB", memory_mb)
             else:
-                logger.debug(f"Memory usage: {memory_mb:.1f} MB")
+                logger.debug("Memory usage: %.1f MB", memory_mb)
                 
         except ImportError:
             logger.debug("psutil not available for memory monitoring")
         except Exception as e:
-            logger.debug(f"Error monitoring memory: {e}")
+            logger.debug("Error monitoring memory: %s", e)
 
 # Batch processing utilities
 class BatchProcessor:
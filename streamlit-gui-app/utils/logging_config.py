@@ -2,60 +2,100 @@
 Logging configuration for the GUI Testing Tool
 """
 
+import atexit
 import logging
+import queue
 import sys
+import traceback
+from collections import deque
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 import streamlit as st
 
+# Routine startup, processing, and cleanup messages kept out of the UI
+UI_SKIP_MESSAGES = (
+    "Starting GUI Testing Tool",
+    "Connecting to Neo4j",
+    "Database connection established",
+    "Found existing business scenarios",
+    "Application initialized successfully",
+    "Business scenarios loaded",
+    "Database connection closed",
+    "Reset connection state",
+    "Application cleanup completed",
+    "Slow function",  # Performance timing messages
+    "Generating test steps for query",  # Test generation process
+    "Successfully generated test plan",  # Test generation success
+    "Generated",  # General generation messages
+    "Loading business scenarios into ChromaDB",
+    "Refreshing database connection",
+    "Connection refresh completed",
+    "Connection test successful",
+    "Cleared graph data cache",
+    "Cleared",  # Cache clearing messages
+    "Application interrupted by user"
+)
+
+# Per-session buffer of (levelno, message) waiting to be shown, and its cap
+UI_LOG_BUFFER_KEY = '_ui_log_buffer'
+UI_LOG_BUFFER_SIZE = 50
+
 class StreamlitLogHandler(logging.Handler):
-    """Custom log handler that displays logs in Streamlit"""
+    """
+    Custom log handler that displays logs in Streamlit
+    
+    Records are buffered in the session and shown together by flush_to_ui,
+    one element per level, instead of one element per record.
+    """
     
     def emit(self, record):
-        """Emit a log record to Streamlit"""
+        """Buffer a log record for the current session"""
         try:
             msg = self.format(record)
             
-            # Skip routine startup, processing, and cleanup messages to reduce UI noise
-            skip_messages = [
-                "Starting GUI Testing Tool",
-                "Connecting to Neo4j",
-                "Database connection established",
-                "Found existing business scenarios",
-                "Application initialized successfully",
-                "Business scenarios loaded",
-                "Database connection closed",
-                "Reset connection state",
-                "Application cleanup completed",
-                "Slow function",  # Performance timing messages
-                "Generating test steps for query",  # Test generation process
-                "Successfully generated test plan",  # Test generation success
-                "Generated",  # General generation messages
-                "Loading business scenarios into ChromaDB",
-                "Refreshing database connection",
-                "Connection refresh completed",
-                "Connection test successful",
-                "Cleared graph data cache",
-                "Cleared",  # Cache clearing messages
-                "Application interrupted by user"
-            ]
-            
-            if any(skip_msg in msg for skip_msg in skip_messages):
+            if any(skip_msg in msg for skip_msg in UI_SKIP_MESSAGES):
                 return  # Don't show these routine startup messages
             
-            if record.levelno >= logging.ERROR:
-                st.error(f"❌ {msg}")
-            elif record.levelno >= logging.WARNING:
-                st.warning(f"⚠️ {msg}")
-            elif record.levelno >= logging.INFO:
-                # Only show important INFO messages, not routine ones
-                if any(important in msg.lower() for important in ['error', 'failed', 'success', 'completed']):
-                    st.info(f"ℹ️ {msg}")
-            else:
-                st.text(msg)
+            buffer = st.session_state.get(UI_LOG_BUFFER_KEY)
+            if buffer is None:
+                buffer = st.session_state[UI_LOG_BUFFER_KEY] = deque(maxlen=UI_LOG_BUFFER_SIZE)
+            buffer.append((record.levelno, msg))
         except Exception:
             self.handleError(record)
+    
+    @staticmethod
+    def flush_to_ui(container=None) -> None:
+        """Show and clear the buffered log messages, grouped by level"""
+        buffer = st.session_state.get(UI_LOG_BUFFER_KEY)
+        if not buffer:
+            return
+        
+        # The handler level is WARNING, so only warnings and errors arrive
+        errors, warnings = [], []
+        for levelno, msg in buffer:
+            if levelno >= logging.ERROR:
+                errors.append(f"❌ {msg}")
+            else:
+                warnings.append(f"⚠️ {msg}")
+        buffer.clear()
+        
+        with container if container is not None else st.container():
+            if errors:
+                st.error("\n\n".join(errors))
+            if warnings:
+                st.warning("\n\n".join(warnings))
+
+# Background listener that owns the console/file handlers
+_queue_listener: Optional[QueueListener] = None
+
+def _stop_queue_listener() -> None:
+    """Flush queued records on interpreter exit"""
+    if _queue_listener is not None:
+        _queue_listener.stop()
+
+atexit.register(_stop_queue_listener)
 
 def setup_logging(
     log_level: str = "INFO",
@@ -73,12 +113,17 @@ def setup_logging(
     Returns:
         Logger instance
     """
+    global _queue_listener
+    
     # Create logger
     logger = logging.getLogger("gui_testing_tool")
     logger.setLevel(getattr(logging, log_level.upper()))
     
     # Clear existing handlers
     logger.handlers.clear()
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
     
     # Create formatter
     formatter = logging.Formatter(
@@ -89,23 +134,31 @@ def setup_logging(
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(logging.DEBUG)
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    io_handlers = [console_handler]
     
     # File handler (if specified)
     if log_file:
         log_path = Path(log_file)
         log_path.parent.mkdir(parents=True, exist_ok=True)
         
-        file_handler = logging.FileHandler(log_file)
+        file_handler = RotatingFileHandler(log_file, maxBytes=10 * 1024 * 1024, backupCount=3)
         file_handler.setLevel(logging.DEBUG)
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        io_handlers.append(file_handler)
+    
+    # Console and file writes happen on a background listener thread so
+    # logging calls never block the Streamlit script thread on I/O
+    log_queue = queue.SimpleQueue()
+    _queue_listener = QueueListener(log_queue, *io_handlers, respect_handler_level=True)
+    _queue_listener.start()
+    logger.addHandler(QueueHandler(log_queue))
     
     # Streamlit handler (if in Streamlit context)
     if include_streamlit:
         try:
             streamlit_handler = StreamlitLogHandler()
-            streamlit_handler.setLevel(logging.INFO)
+            # Warnings and errors only; records below are never formatted
+            streamlit_handler.setLevel(logging.WARNING)
             streamlit_handler.setFormatter(
                 logging.Formatter('%(levelname)s: %(message)s')
             )
@@ -120,11 +173,11 @@ def log_function_call(func):
     """Decorator to log function calls"""
     def wrapper(*args, **kwargs):
         logger = logging.getLogger("gui_testing_tool")
-        logger.debug(f"Calling {func.__name__} with args={args}, kwargs={kwargs}")
+        logger.debug("Calling %s with args=%s, kwargs=%s", func.__name__, args, kwargs)
         
         try:
             result = func(*args, **kwargs)
-            logger.debug(f"{func.__name__} completed successfully")
+            logger.debug("%s completed successfully", func.__name__)
             return result
         except Exception as e:
             logger.error(f"Error in {func.__name__}: {str(e)}")
@@ -153,7 +206,6 @@ def handle_error(error: Exception, context: str = "", show_in_ui: bool = True) -
         with st.expander("🔍 Error Details"):
             st.code(str(error))
             if hasattr(error, '__traceback__'):
-                import traceback
                 st.text("Traceback:")
                 st.code(traceback.format_exc())
 
@@ -166,7 +218,7 @@ class ErrorContext:
         self.logger = logging.getLogger("gui_testing_tool")
     
     def __enter__(self):
-        self.logger.debug(f"Entering context: {self.context}")
+        self.logger.debug("Entering context: %s", self.context)
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
@@ -174,7 +226,7 @@ class ErrorContext:
             handle_error(exc_val, self.context, self.show_in_ui)
             return False  # Don't suppress the exception
         
-        self.logger.debug(f"Exiting context: {self.context}")
+        self.logger.debug("Exiting context: %s", self.context)
         return True
 
 # Pre-configured logger instance
@@ -2,63 +2,88 @@
 Session state management utilities for Streamlit app
 """
 
+import logging
 import streamlit as st
-from typing import Any, Dict, Optional, Callable
+from typing import Any, Dict, Optional, Callable, Tuple
 from utils.logging_config import logger, ErrorContext
 
+# Session keys that validate_session_state depends on
+VALIDATED_KEYS = frozenset({'kg', 'query_interface', 'connection_status'})
+
+# Initial session state values
+SESSION_DEFAULTS = {
+    'kg': None,
+    'query_interface': None,
+    'connection_status': 'disconnected',
+    'current_plan': None,
+    'scenarios_initialized': False,
+    'neo4j_uri': "bolt://localhost:7687",
+    'neo4j_user': "neo4j", 
+    'neo4j_pass': "tiktoktechjam",
+    'planning_agent_data': None,
+    'execution_data': None
+}
+
 class SessionManager:
     """Manages Streamlit session state with type safety and validation"""
     
     @staticmethod
     def initialize_session_state() -> None:
         """Initialize all session state variables with default values"""
-        defaults = {
-            'kg': None,
-            'query_interface': None,
-            'connection_status': 'disconnected',
-            'current_plan': None,
-            'scenarios_initialized': False,
-            'neo4j_uri': "bolt://localhost:7687",
-            'neo4j_user': "neo4j", 
-            'neo4j_pass': "tiktoktechjam",
-            'planning_agent_data': None,
-            'execution_data': None
-        }
+        state = st.session_state
+        missing = {key: value for key, value in SESSION_DEFAULTS.items() if key not in state}
+        if not missing:
+            return
         
-        for key, default_value in defaults.items():
-            if key not in st.session_state:
-                st.session_state[key] = default_value
-                logger.debug(f"Initialized session state: {key} = {default_value}")
+        state.update(missing)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Initialized session state: %s", missing)
     
     @staticmethod
     def get(key: str, default: Any = None) -> Any:
         """Safely get a value from session state"""
         return st.session_state.get(key, default)
     
+    @staticmethod
+    def get_many(*keys: str, default: Any = None) -> Tuple[Any, ...]:
+        """Get several values from session state in one pass"""
+        state = st.session_state
+        return tuple(state.get(key, default) for key in keys)
+    
     @staticmethod
     def set(key: str, value: Any) -> None:
         """Set a value in session state with logging"""
-        old_value = st.session_state.get(key)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Session state updated: %s = %s (was: %s)", key, value, st.session_state.get(key))
         st.session_state[key] = value
-        logger.debug(f"Session state updated: {key} = {value} (was: {old_value})")
+        
+        if key in VALIDATED_KEYS:
+            SessionManager.mark_dirty()
     
     @staticmethod
     def update(updates: Dict[str, Any]) -> None:
         """Update multiple session state values"""
-        for key, value in updates.items():
-            SessionManager.set(key, value)
+        st.session_state.update(updates)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Session state updated: %s", updates)
+        
+        if not VALIDATED_KEYS.isdisjoint(updates):
+            SessionManager.mark_dirty()
     
     @staticmethod
     def clear_key(key: str) -> None:
         """Clear a specific session state key"""
         if key in st.session_state:
             del st.session_state[key]
-            logger.debug(f"Cleared session state key: {key}")
+            logger.debug("Cleared session state key: %s", key)
+        
+        if key in VALIDATED_KEYS:
+            SessionManager.mark_dirty()
     
     @staticmethod
     def reset_connection_state() -> None:
         """Reset connection-related session state"""
-        keys_to_clear = ['kg', 'query_interface', 'connection_status', 'scenarios_initialized']
+        keys_to_clear = ['kg', 'query_interface', 'connection_status', 'scenarios_initialized', '_initialized']
         for key in keys_to_clear:
             SessionManager.clear_key(key)
         logger.info("Reset connection state")
@@ -74,9 +99,22 @@ class SessionManager:
         plan = SessionManager.get('current_plan')
         return plan is not None and hasattr(plan, 'steps') and len(plan.steps) > 0
     
+    @staticmethod
+    def mark_dirty() -> None:
+        """Invalidate the cached validate_session_state result"""
+        st.session_state['_validation_cache_valid'] = False
+    
     @staticmethod
     def validate_session_state() -> Dict[str, str]:
-        """Validate session state and return any issues"""
+        """
+        Validate session state and return any issues
+        
+        The result is cached in session state and only recomputed after one
+        of the connection keys changes (see mark_dirty).
+        """
+        if st.session_state.get('_validation_cache_valid'):
+            return st.session_state['_validation_result']
+        
         issues = {}
         
         # Check required components
@@ -89,4 +127,6 @@ class SessionManager:
         if SessionManager.get('connection_status') != 'connected':
             issues['connection'] = "Not connected to Neo4j database"
         
+        st.session_state['_validation_result'] = issues
+        st.session_state['_validation_cache_valid'] = True
         return issues
\ No newline at end of file
@@ -2,38 +2,130 @@
 Simple status monitoring for automation execution (replaces WebSocket manager)
 """
 
+import base64
 import streamlit as st
 import requests
 from typing import Dict, Any, Optional, Tuple
 from utils.logging_config import logger
 from config.settings import settings
+from services.automation_service import (
+    get_http_session,
+    get_long_poll_session,
+    read_json_response,
+    STATUS_URL_TEMPLATE,
+    LOGS_URL_TEMPLATE,
+    SCREENSHOT_URL_TEMPLATE,
+    BUNDLE_URL_TEMPLATE
+)
+
+# Executions whose status can still change, so it is long-polled
+ACTIVE_EXECUTION_STATUSES = frozenset({"pending", "started", "running"})
+
+# Results of a finished execution don't change, so they are cached across
+# sessions; screenshots are large, hence the entry cap
+RESULTS_CACHE_TTL = 3600
+RESULTS_CACHE_MAX_ENTRIES = 32
+
+@st.cache_data(ttl=RESULTS_CACHE_TTL, max_entries=RESULTS_CACHE_MAX_ENTRIES, show_spinner=False)
+def fetch_execution_logs(execution_id: str) -> str:
+    """Download the logs of an execution; failures raise and are therefore never cached"""
+    response = get_http_session().get(
+        LOGS_URL_TEMPLATE.format(execution_id),
+        timeout=settings.automation.timeout
+    )
+    response.raise_for_status()
+    return response.text
+
+@st.cache_data(ttl=RESULTS_CACHE_TTL, max_entries=RESULTS_CACHE_MAX_ENTRIES, show_spinner=False)
+def fetch_execution_screenshot(execution_id: str) -> bytes:
+    """Download the final screenshot of an execution; failures raise and are never cached"""
+    response = get_http_session().get(
+        SCREENSHOT_URL_TEMPLATE.format(execution_id),
+        timeout=settings.automation.timeout
+    )
+    response.raise_for_status()
+    return response.content
+
+@st.cache_data(ttl=RESULTS_CACHE_TTL, max_entries=RESULTS_CACHE_MAX_ENTRIES, show_spinner=False)
+def fetch_execution_bundle(execution_id: str) -> Dict[str, Any]:
+    """Download the results bundle of an execution; failures raise and are never cached"""
+    response = get_http_session().get(
+        BUNDLE_URL_TEMPLATE.format(execution_id),
+        timeout=settings.automation.timeout
+    )
+    response.raise_for_status()
+    bundle = response.json()
+    
+    screenshot_b64 = bundle.get("screenshot_b64")
+    return {
+        "status": bundle.get("status"),
+        "logs": bundle.get("logs"),
+        "screenshot": base64.b64decode(screenshot_b64) if screenshot_b64 else None
+    }
 
 
 class ExecutionStatusMonitor:
-    """Simple HTTP-based status monitoring for automation execution"""
+    """
+    Simple HTTP-based status monitoring for automation execution
+    
+    Requests go through the automation service's shared HTTP session, so
+    repeated status, log and screenshot fetches reuse pooled connections.
+    """
     
     @staticmethod
-    def get_execution_status(execution_id: str) -> Tuple[bool, Dict[str, Any]]:
+    def get_execution_status(
+        execution_id: str,
+        since_version: Optional[Any] = None,
+        wait: int = 0
+    ) -> Tuple[bool, Optional[Dict[str, Any]]]:
         """
         Get the current status of an automation execution
         
+        With since_version and wait, this is a long poll: the server holds
+        the request until the status version moves past since_version or
+        wait seconds pass, answering 204 in the latter case.
+        
         Args:
             execution_id: ID of the execution to check
+            since_version: Last status version seen by the caller
+            wait: Seconds the server may hold the request
             
         Returns:
-            Tuple of (success, status_data)
+            Tuple of (success, status_data); status_data is None if the
+            status did not change within the wait
         """
         try:
-            status_endpoint = f"{settings.automation.base_url}/status/{execution_id}"
+            status_endpoint = STATUS_URL_TEMPLATE.format(execution_id)
             
-            response = requests.get(
+            session = get_http_session()
+            params = None
+            timeout = settings.automation.health_check_timeout
+            if since_version is not None and wait > 0:
+                session = get_long_poll_session()
+                params = {"wait": wait, "since": since_version}
+                timeout += wait
+            
+            response = session.get(
                 status_endpoint, 
-                timeout=settings.automation.health_check_timeout
+                params=params,
+                stream=True,
+                timeout=timeout
             )
-            response.raise_for_status()
+            try:
+                if not response.ok:
+                    # Read the error body now; the HTTPError handler uses it
+                    # after the response is closed
+                    response.content
+                response.raise_for_status()
+                
+                if response.status_code == 204:
+                    return True, None
+                
+                status_data = read_json_response(response)
+            finally:
+                response.close()
             
-            status_data = response.json()
-            logger.debug(f"Retrieved status for execution {execution_id}: {status_data}")
+            logger.debug("Retrieved status for execution %s: %s", execution_id, status_data)
             
             return True, status_data
             
@@ -59,15 +151,7 @@ class ExecutionStatusMonitor:
             Tuple of (success, logs_content)
         """
         try:
-            logs_endpoint = f"{settings.automation.base_url}/logs/{execution_id}"
-            
-            response = requests.get(
-                logs_endpoint,
-                timeout=settings.automation.timeout
-            )
-            response.raise_for_status()
-            
-            return True, response.text
+            return True, fetch_execution_logs(execution_id)
             
         except Exception as e:
             logger.error(f"Error getting execution logs: {e}")
@@ -85,20 +169,48 @@ class ExecutionStatusMonitor:
             Tuple of (success, screenshot_bytes)
         """
         try:
-            screenshot_endpoint = f"{settings.automation.base_url}/screenshot/{execution_id}"
-            
-            response = requests.get(
-                screenshot_endpoint,
-                timeout=settings.automation.timeout
-            )
-            response.raise_for_status()
-            
-            return True, response.content
+            return True, fetch_execution_screenshot(execution_id)
             
         except Exception as e:
             logger.error(f"Error getting execution screenshot: {e}")
             return False, None
 
+    @staticmethod
+    def get_execution_bundle(execution_id: str) -> Tuple[bool, Dict[str, Any]]:
+        """
+        Get the status, logs and final screenshot of a completed execution
+        
+        Uses the server's bundle endpoint so the results take one request.
+        Servers without it (404) are asked for the logs and screenshot
+        separately.
+        
+        Args:
+            execution_id: ID of the execution
+            
+        Returns:
+            Tuple of (success, bundle) where bundle has "status", "logs" and
+            "screenshot" (bytes); parts the server couldn't provide are None
+        """
+        try:
+            return True, fetch_execution_bundle(execution_id)
+            
+        except requests.exceptions.HTTPError as e:
+            if e.response.status_code != 404:
+                logger.error("Error getting execution bundle: %s", e)
+                return False, {"error": str(e)}
+            
+            logs_ok, logs = ExecutionStatusMonitor.get_execution_logs(execution_id)
+            _, screenshot_bytes = ExecutionStatusMonitor.get_execution_screenshot(execution_id)
+            return True, {
+                "status": None,
+                "logs": logs if logs_ok else None,
+                "screenshot": screenshot_bytes
+            }
+            
+        except Exception as e:
+            logger.error("Error getting execution bundle: %s", e)
+            return False, {"error": str(e)}
+
 
 class StreamlitStatusMonitor:
     """Streamlit-specific status monitoring utilities"""
@@ -130,21 +242,86 @@ class StreamlitStatusMonitor:
         if refresh_clicked or status_key not in st.session_state:
             with st.spinner("Checking execution status..."):
                 success, status_data = ExecutionStatusMonitor.get_execution_status(execution_id)
-                
-                if success:
-                    st.session_state[status_key] = status_data
-                else:
-                    st.session_state[status_key] = {"error": status_data.get("error", "Unknown error")}
+                StreamlitStatusMonitor._store_status(execution_id, success, status_data)
         
-        # Display status
+        # Display status, following it live only while the execution runs so
+        # the refresh timer stops with it
+        status_data = st.session_state.get(status_key, {})
         with col_status:
-            status_data = st.session_state.get(status_key, {})
-            StreamlitStatusMonitor._render_status_display(status_data)
+            if (status_data.get("status") in ACTIVE_EXECUTION_STATUSES
+                    and f"exec_ver_{execution_id}" in st.session_state):
+                # This is a full run, so the fragment must not long-poll in it
+                st.session_state[f"exec_poll_{execution_id}"] = False
+                StreamlitStatusMonitor._render_live_status(execution_id)
+            else:
+                StreamlitStatusMonitor._render_status_display(status_data)
         
         # If execution is complete, show final results
         if status_data.get("status") == "completed":
             StreamlitStatusMonitor._render_final_results(execution_id)
     
+    @staticmethod
+    def _store_status(execution_id: str, success: bool, status_data: Optional[Dict[str, Any]]) -> None:
+        """Save a status response and its version in session state"""
+        status_key = f"execution_status_{execution_id}"
+        
+        if not success:
+            st.session_state[status_key] = {"error": status_data.get("error", "Unknown error")}
+            return
+        if status_data is None:
+            # Long poll timed out; the stored status is still current
+            return
+        
+        st.session_state[status_key] = status_data
+        if "version" in status_data:
+            st.session_state[f"exec_ver_{execution_id}"] = status_data["version"]
+    
+    @staticmethod
+    @st.fragment(run_every=settings.automation.status_poll_wait)
+    def _render_live_status(execution_id: str) -> None:
+        """
+        Render the stored status of a running execution and follow it
+        
+        Runs as a fragment on a timer, and is only rendered while the
+        execution is active and the server reports status versions. Its run
+        within the full page run only renders the stored status, so the page
+        never waits on the server; the timed reruns of the fragment alone
+        long-poll for the next change. Once following stops, a full rerun
+        renders the status without the fragment, which ends the timer.
+        """
+        status_key = f"execution_status_{execution_id}"
+        version_key = f"exec_ver_{execution_id}"
+        poll_key = f"exec_poll_{execution_id}"
+        
+        status_data = st.session_state.get(status_key, {})
+        polling = st.session_state.get(poll_key, False)
+        # Every later run until the next full run is a fragment rerun
+        st.session_state[poll_key] = True
+        
+        since_version = st.session_state.get(version_key)
+        if (polling and since_version is not None
+                and status_data.get("status") in ACTIVE_EXECUTION_STATUSES):
+            # The previous status stays on screen while the server holds the request
+            success, new_data = ExecutionStatusMonitor.get_execution_status(
+                execution_id,
+                since_version=since_version,
+                wait=settings.automation.status_poll_wait
+            )
+            if success and new_data is not None and new_data.get("version") == since_version:
+                # The server answered at once without a change, so it doesn't
+                # long-poll; stop following rather than re-request every tick.
+                # The Check Progress button still refreshes by hand
+                del st.session_state[version_key]
+                st.rerun()
+            else:
+                StreamlitStatusMonitor._store_status(execution_id, success, new_data)
+                status_data = st.session_state[status_key]
+                if status_data.get("status") not in ACTIVE_EXECUTION_STATUSES:
+                    # Final results and errors render outside the fragment
+                    st.rerun()
+        
+        StreamlitStatusMonitor._render_status_display(status_data)
+    
     @staticmethod
     def _render_status_display(status_data: Dict[str, Any]) -> None:
         """Render the status display based on status data"""
@@ -187,49 +364,60 @@ class StreamlitStatusMonitor:
         st.markdown("---")
         st.markdown("### 📋 Final Results")
         
+        # Logs and screenshot arrive together and are kept for later reruns
+        bundle_key = f"execution_bundle_{execution_id}"
+        if bundle_key not in st.session_state:
+            if not st.button("📥 Load Results", key=f"load_results_{execution_id}"):
+                return
+            
+            with st.spinner("Loading execution results..."):
+                success, bundle = ExecutionStatusMonitor.get_execution_bundle(execution_id)
+            
+            if not success:
+                st.error(f"Failed to load results: {bundle['error']}")
+                return
+            st.session_state[bundle_key] = bundle
+        
+        bundle = st.session_state[bundle_key]
+        
         # Create tabs for logs and screenshot
         tab_logs, tab_screenshot = st.tabs(["📜 Logs", "📸 Screenshot"])
         
         with tab_logs:
-            if st.button("📥 Load Logs", key=f"load_logs_{execution_id}"):
-                with st.spinner("Loading execution logs..."):
-                    success, logs = ExecutionStatusMonitor.get_execution_logs(execution_id)
-                    
-                    if success:
-                        st.text_area(
-                            "Execution Logs",
-                            value=logs,
-                            height=400,
-                            key=f"logs_{execution_id}",
-                            label_visibility="collapsed"
-                        )
-                    else:
-                        st.error(f"Failed to load logs: {logs}")
+            if bundle["logs"] is not None:
+                st.text_area(
+                    "Execution Logs",
+                    value=bundle["logs"],
+                    height=400,
+                    key=f"logs_{execution_id}",
+                    label_visibility="collapsed"
+                )
+            else:
+                st.error("Failed to load logs")
         
         with tab_screenshot:
-            if st.button("📷 Load Screenshot", key=f"load_screenshot_{execution_id}"):
-                with st.spinner("Loading final screenshot..."):
-                    success, screenshot_bytes = ExecutionStatusMonitor.get_execution_screenshot(execution_id)
-                    
-                    if success and screenshot_bytes:
-                        st.image(
-                            screenshot_bytes,
-                            caption="Final Screenshot",
-                            use_column_width=True
-                        )
-                    else:
-                        st.error("Failed to load screenshot")
+            if bundle["screenshot"]:
+                st.image(
+                    bundle["screenshot"],
+                    caption="Final Screenshot",
+                    use_column_width=True
+                )
+            else:
+                st.error("Failed to load screenshot")
     
     @staticmethod
     def clear_execution_data(execution_id: str) -> None:
         """
-        Clear cached execution data from session state
+        Clear cached execution data from session state and the result caches
         
         Args:
             execution_id: ID of the execution to clear
         """
         keys_to_remove = [
             f"execution_status_{execution_id}",
+            f"exec_ver_{execution_id}",
+            f"exec_poll_{execution_id}",
+            f"execution_bundle_{execution_id}",
             f"logs_{execution_id}",
             f"screenshot_{execution_id}"
         ]
@@ -238,4 +426,8 @@ class StreamlitStatusMonitor:
             if key in st.session_state:
                 del st.session_state[key]
         
-        logger.debug(f"Cleared execution data for {execution_id}")
\ No newline at end of file
+        # The caches can't drop a single execution, so they are emptied
+        for fetch in (fetch_execution_logs, fetch_execution_screenshot, fetch_execution_bundle):
+            fetch.clear()
+        
+        logger.debug("Cleared execution data for %s", execution_id)
\ No newline at end of file
@@ -8,6 +8,34 @@ from typing import List, Dict, Any, Optional
 from config.settings import settings
 from utils.logging_config import logger
 
+# Scenario card HTML, parsed once at import instead of per card
+SCENARIO_CARD_TEMPLATE = """
+        <div style='padding: 15px; background-color: {card_background}; 
+                    border-radius: 8px; border-left: 4px solid {border_color};'>
+            <div style='color: {primary_color}; font-weight: bold; margin-bottom: 10px;'>
+                📋 {feature}
+            </div>
+            <div style='color: {text_color}; margin-bottom: 10px;'>
+                <strong>Goal:</strong> {goal}
+            </div>
+            <div style='color: {secondary_color}; margin-bottom: 10px;'>
+                <strong>Type:</strong> {scenario_type}
+            </div>
+            <div style='color: {text_color}; margin-bottom: 10px;'>
+                <strong>Given:</strong> {given}
+            </div>
+            <div style='color: {text_color}; margin-bottom: 10px;'>
+                <strong>When:</strong> {when}
+            </div>
+            <div style='color: {text_color}; margin-bottom: 10px;'>
+                <strong>Then:</strong> {then}
+            </div>
+            <div style='color: {text_color};'>
+                <strong>Tags:</strong> {tags}
+            </div>
+        </div>
+        """
+
 class UIComponents:
     """Collection of reusable UI components"""
     
@@ -80,6 +108,11 @@ class UIComponents:
     @staticmethod
     def render_step_card(step, step_index: int) -> None:
         """Render an ExecutorStep as a styled card"""
+        st.markdown(UIComponents.build_step_card_html(step, step_index), unsafe_allow_html=True)
+    
+    @staticmethod
+    def build_step_card_html(step, step_index: int) -> str:
+        """Build the HTML for an ExecutorStep card"""
         # Action type color mapping
         action_color_mapping = {
             'tap': settings.ui.primary_color,
@@ -97,7 +130,7 @@ class UIComponents:
         expected_result = step.expected_state if step.expected_state else "Stay in current state"
         
         
-        step_content = f"""
+        return f"""
         <div style='margin: 15px 0; padding: 15px; background-color: {settings.ui.card_background}; 
                     border-radius: 8px; border-left: 4px solid {border_color};'>
             <div style='display: flex; align-items: center; flex-wrap: wrap; gap: 15px;'>
@@ -117,40 +150,26 @@ class UIComponents:
             </div>
         </div>
         """
-        
-        st.markdown(step_content, unsafe_allow_html=True)
     
     @staticmethod
     def render_scenario_card(scenario, index: int) -> None:
         """Render a business scenario card"""
         border_color = settings.ui.primary_color if index % 2 == 0 else settings.ui.secondary_color
         
-        st.markdown(f"""
-        <div style='padding: 15px; background-color: {settings.ui.card_background}; 
-                    border-radius: 8px; border-left: 4px solid {border_color};'>
-            <div style='color: {settings.ui.primary_color}; font-weight: bold; margin-bottom: 10px;'>
-                📋 {scenario.feature}
-            </div>
-            <div style='color: {settings.ui.text_color}; margin-bottom: 10px;'>
-                <strong>Goal:</strong> {scenario.goal}
-            </div>
-            <div style='color: {settings.ui.secondary_color}; margin-bottom: 10px;'>
-                <strong>Type:</strong> {scenario.scenario_type}
-            </div>
-            <div style='color: {settings.ui.text_color}; margin-bottom: 10px;'>
-                <strong>Given:</strong> {', '.join(scenario.given_conditions)}
-            </div>
-            <div style='color: {settings.ui.text_color}; margin-bottom: 10px;'>
-                <strong>When:</strong> {', '.join(scenario.when_actions)}
-            </div>
-            <div style='color: {settings.ui.text_color}; margin-bottom: 10px;'>
-                <strong>Then:</strong> {', '.join(scenario.then_expectations)}
-            </div>
-            <div style='color: {settings.ui.text_color};'>
-                <strong>Tags:</strong> {', '.join(scenario.tags)}
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(SCENARIO_CARD_TEMPLATE.format_map({
+            'border_color': border_color,
+            'card_background': settings.ui.card_background,
+            'primary_color': settings.ui.primary_color,
+            'secondary_color': settings.ui.secondary_color,
+            'text_color': settings.ui.text_color,
+            'feature': scenario.feature,
+            'goal': scenario.goal,
+            'scenario_type': scenario.scenario_type,
+            'given': scenario._given_str,
+            'when': scenario._when_str,
+            'then': scenario._then_str,
+            'tags': scenario._tags_str
+        }), unsafe_allow_html=True)
     
     @staticmethod
     def render_error_message(message: str, details: Optional[str] = None):